@@ -3,38 +3,104 @@ Quantum Battleship Flask API
 Main application file with REST API endpoints
 """
 
-from flask import Flask, request, jsonify
-from flask_cors import CORS
-import uuid
+from flask import Flask
+from functools import wraps
 from game_logic import game_manager
 from models import ShipType
+from response_cache import ResponseCache
+from http_json import j, raw, dumps, read_json
+from game_ids import next_uuid
+from schemas import check, validate_place_ship, validate_shoot
 
 app = Flask(__name__)
-CORS(app)  # Enable CORS for frontend communication
+
+# Serve '/path' and '/path/' alike instead of answering with a 308 redirect
+app.url_map.strict_slashes = False
+
+
+@app.after_request
+def add_cors_headers(response):
+    """Static CORS policy for frontend communication (any origin)"""
+    response.headers['Access-Control-Allow-Origin'] = '*'
+    response.headers['Access-Control-Allow-Headers'] = 'Content-Type'
+    response.headers['Access-Control-Allow-Methods'] = 'GET, POST, DELETE, OPTIONS'
+    return response
 
 
 # Store active games
 # game_manager is already instantiated in game_logic.py
 
+# Serialized GET responses keyed by (game_id, state_version)
+_state_cache = ResponseCache(maxsize=4096)
+
+# Validation error messages per failing field ('data' = missing fields)
+_PLACE_SHIP_ERRORS = {
+    "data": "Missing required fields. Required: ['ship_type', 'start_x', 'start_y', 'orientation']"
+}
+
+_SHOOT_ERRORS = {
+    "data": "Missing coordinates (x, y)",
+    "data.x": "Coordinates must be between 0 and 9",
+    "data.y": "Coordinates must be between 0 and 9"
+}
+
+
+def require_game(fn):
+    """
+    Look up the game named in the URL once and pass it to the view.
+
+    Wrapped views take (game_id, game, ...) and never see a missing game;
+    unknown IDs get the standard 404 body.
+    """
+    @wraps(fn)
+    def wrapper(game_id, *args, **kwargs):
+        game = game_manager.get_game(game_id)
+        if game is None:
+            return j({
+                "success": False,
+                "message": "Game not found"
+            }, 404)
+        return fn(game_id, game, *args, **kwargs)
+    return wrapper
+
+
+# Static response bodies, serialized once at import
+_HOME_JSON = dumps({
+    "message": "Quantum Battleship API",
+    "version": "1.0.0",
+    "endpoints": {
+        "POST /api/game/new": "Create a new game",
+        "GET /api/game/<game_id>": "Get game state",
+        "POST /api/game/<game_id>/setup": "Auto-setup AI board",
+        "POST /api/game/<game_id>/place-ship": "Place player ship",
+        "POST /api/game/<game_id>/auto-place": "Auto-place all player ships",
+        "POST /api/game/<game_id>/shoot": "Player shoots at AI board",
+        "POST /api/game/<game_id>/ai-turn": "AI takes turn",
+        "POST /api/game/<game_id>/reset": "Reset game",
+        "DELETE /api/game/<game_id>": "Delete game"
+    }
+})
+
+_SHIPS_JSON = dumps({
+    "success": True,
+    "ships": [
+        {
+            "name": ship_type.name,
+            "display_name": ship_type.ship_name,
+            "length": ship_type.length
+        }
+        for ship_type in ShipType
+    ]
+})
+
+# Only the game count varies; spliced into the pre-encoded body per request
+_HEALTH_JSON = b'{"status":"healthy","active_games":%d}'
+
 
 @app.route('/')
 def home():
     """API home endpoint"""
-    return jsonify({
-        "message": "Quantum Battleship API",
-        "version": "1.0.0",
-        "endpoints": {
-            "POST /api/game/new": "Create a new game",
-            "GET /api/game/<game_id>": "Get game state",
-            "POST /api/game/<game_id>/setup": "Auto-setup AI board",
-            "POST /api/game/<game_id>/place-ship": "Place player ship",
-            "POST /api/game/<game_id>/auto-place": "Auto-place all player ships",
-            "POST /api/game/<game_id>/shoot": "Player shoots at AI board",
-            "POST /api/game/<game_id>/ai-turn": "AI takes turn",
-            "POST /api/game/<game_id>/reset": "Reset game",
-            "DELETE /api/game/<game_id>": "Delete game"
-        }
-    })
+    return raw(_HOME_JSON)
 
 
 @app.route('/api/game/new', methods=['POST'])
@@ -43,60 +109,53 @@ def create_new_game():
     Create a new game instance.
     Body: { "player_name": "optional name" }
     """
-    data = request.get_json() or {}
+    data = read_json() or {}
     player_name = data.get('player_name', 'Player')
 
     # Generate unique game ID
-    game_id = str(uuid.uuid4())
+    game_id = next_uuid()
 
     # Create game
     game = game_manager.create_game(game_id, player_name)
 
-    return jsonify({
+    return j({
         "success": True,
         "message": "Game created successfully",
         "game_id": game_id,
         "game": game.to_dict()
-    }), 201
+    }, 201)
 
 
 @app.route('/api/game/<game_id>', methods=['GET'])
-def get_game_state(game_id):
+@require_game
+def get_game_state(game_id, game):
     """Get current game state"""
-    game = game_manager.get_game(game_id)
+    key = (game_id, game.state_version)
+    body = _state_cache.get(key)
 
-    if not game:
-        return jsonify({
-            "success": False,
-            "message": "Game not found"
-        }), 404
+    if body is None:
+        body = dumps({
+            "success": True,
+            "game": game.to_dict()
+        })
+        _state_cache.put(key, body)
 
-    return jsonify({
-        "success": True,
-        "game": game.to_dict()
-    })
+    return raw(body)
 
 
 @app.route('/api/game/<game_id>/setup', methods=['POST'])
-def setup_game(game_id):
+@require_game
+def setup_game(game_id, game):
     """
     Setup AI board with ships.
     Body: { "use_quantum": true/false }
     """
-    game = game_manager.get_game(game_id)
-
-    if not game:
-        return jsonify({
-            "success": False,
-            "message": "Game not found"
-        }), 404
-
-    data = request.get_json() or {}
+    data = read_json() or {}
     use_quantum = data.get('use_quantum', True)
 
     success = game_manager.setup_ai_board(game_id, use_quantum)
 
-    return jsonify({
+    return j({
         "success": success,
         "message": "AI board setup complete" if success else "Failed to setup AI board",
         "quantum_mode": use_quantum
@@ -104,7 +163,8 @@ def setup_game(game_id):
 
 
 @app.route('/api/game/<game_id>/place-ship', methods=['POST'])
-def place_ship(game_id):
+@require_game
+def place_ship(game_id, game):
     """
     Place a ship on player's board.
     Body: {
@@ -114,28 +174,20 @@ def place_ship(game_id):
         "orientation": "horizontal/vertical"
     }
     """
-    game = game_manager.get_game(game_id)
-
-    if not game:
-        return jsonify({
-            "success": False,
-            "message": "Game not found"
-        }), 404
-
-    data = request.get_json()
+    data = read_json()
 
     if not data:
-        return jsonify({
+        return j({
             "success": False,
             "message": "No data provided"
-        }), 400
+        }, 400)
 
-    required_fields = ['ship_type', 'start_x', 'start_y', 'orientation']
-    if not all(field in data for field in required_fields):
-        return jsonify({
+    error = check(validate_place_ship, data, _PLACE_SHIP_ERRORS)
+    if error:
+        return j({
             "success": False,
-            "message": f"Missing required fields. Required: {required_fields}"
-        }), 400
+            "message": error
+        }, 400)
 
     result = game_manager.place_player_ship(
         game_id,
@@ -145,7 +197,7 @@ def place_ship(game_id):
         data['orientation']
     )
 
-    return jsonify(result)
+    return j(result)
 
 
 @app.route('/api/game/<game_id>/auto-place', methods=['POST'])
@@ -154,45 +206,33 @@ def auto_place_ships(game_id):
     result = game_manager.auto_place_player_ships(game_id)
 
     if not result["success"]:
-        return jsonify(result), 404
+        return j(result, 404)
 
-    return jsonify(result)
+    return j(result)
 
 
 @app.route('/api/game/<game_id>/shoot', methods=['POST'])
-def player_shoot(game_id):
+@require_game
+def player_shoot(game_id, game):
     """
     Player shoots at AI board.
     Body: { "x": 0-9, "y": 0-9 }
     """
-    game = game_manager.get_game(game_id)
+    data = read_json()
 
-    if not game:
-        return jsonify({
+    error = check(validate_shoot, data, _SHOOT_ERRORS)
+    if error:
+        return j({
             "success": False,
-            "message": "Game not found"
-        }), 404
-
-    data = request.get_json()
-
-    if not data or 'x' not in data or 'y' not in data:
-        return jsonify({
-            "success": False,
-            "message": "Missing coordinates (x, y)"
-        }), 400
+            "message": error
+        }, 400)
 
     x = data['x']
     y = data['y']
 
-    if not (0 <= x <= 9 and 0 <= y <= 9):
-        return jsonify({
-            "success": False,
-            "message": "Coordinates must be between 0 and 9"
-        }), 400
-
     result = game_manager.player_shoot(game_id, x, y)
 
-    return jsonify(result)
+    return j(result)
 
 
 @app.route('/api/game/<game_id>/ai-turn', methods=['POST'])
@@ -201,25 +241,21 @@ def ai_turn(game_id):
     result = game_manager.ai_shoot(game_id)
 
     if not result["success"]:
-        return jsonify(result), 400
+        return j(result, 400)
 
-    return jsonify(result)
+    return j(result)
 
 
 @app.route('/api/game/<game_id>/reset', methods=['POST'])
 def reset_game(game_id):
     """Reset game to initial state"""
-    game = game_manager.get_game(game_id)
-
-    if not game:
-        return jsonify({
+    if not game_manager.reset_if_present(game_id):
+        return j({
             "success": False,
             "message": "Game not found"
-        }), 404
-
-    game_manager.reset_game(game_id)
+        }, 404)
 
-    return jsonify({
+    return j({
         "success": True,
         "message": "Game reset successfully"
     })
@@ -228,17 +264,13 @@ def reset_game(game_id):
 @app.route('/api/game/<game_id>', methods=['DELETE'])
 def delete_game(game_id):
     """Delete a game"""
-    game = game_manager.get_game(game_id)
-
-    if not game:
-        return jsonify({
+    if game_manager.pop_game(game_id) is None:
+        return j({
             "success": False,
             "message": "Game not found"
-        }), 404
-
-    game_manager.delete_game(game_id)
+        }, 404)
 
-    return jsonify({
+    return j({
         "success": True,
         "message": "Game deleted successfully"
     })
@@ -247,46 +279,35 @@ def delete_game(game_id):
 @app.route('/api/ships', methods=['GET'])
 def get_ship_types():
     """Get available ship types and their properties"""
-    ships = []
-    for ship_type in ShipType:
-        ships.append({
-            "name": ship_type.name,
-            "display_name": ship_type.ship_name,
-            "length": ship_type.length
-        })
-
-    return jsonify({
-        "success": True,
-        "ships": ships
-    })
+    return raw(_SHIPS_JSON)
 
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
-    return jsonify({
-        "status": "healthy",
-        "active_games": len(game_manager.games)
-    })
+    return raw(_HEALTH_JSON % len(game_manager.games))
 
 
 @app.errorhandler(404)
 def not_found(error):
     """Handle 404 errors"""
-    return jsonify({
+    return j({
         "success": False,
         "message": "Endpoint not found"
-    }), 404
+    }, 404)
 
 
 @app.errorhandler(500)
 def internal_error(error):
     """Handle 500 errors"""
-    return jsonify({
+    return j({
         "success": False,
         "message": "Internal server error"
-    }), 500
+    }, 500)
 
 
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=5001)
\ No newline at end of file
+    print(" Development server only - for production use:")
+    print("   gunicorn -c gunicorn_config.py wsgi:app\n")
+
+    app.run(debug=True, host='0.0.0.0', port=5001)
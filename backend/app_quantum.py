@@ -3,41 +3,146 @@ Quantum Battleship Flask API - Hackathon Implementation
 Based on Elitzur-Vaidman bomb tester experiment
 """
 
-from flask import Flask, request, jsonify
-from flask_cors import CORS
-import uuid
+from flask import Flask, request
+from functools import wraps
 from quantum_battleship_core import QuantumBattleshipGame
-from typing import Dict
+from circuit_pool import run_rotations
+from concurrent_games import ShardedGameStore
+from response_cache import ResponseCache
+from http_json import j, raw, dumps, read_json
+from game_ids import next_uuid
+from schemas import check, validate_set_ships, validate_bomb
+import itertools
+import os
 import random
+import sys
 
 app = Flask(__name__)
-CORS(app)
 
-# Store active games
-games: Dict[str, QuantumBattleshipGame] = {}
+# Serve '/path' and '/path/' alike instead of answering with a 308 redirect
+app.url_map.strict_slashes = False
+
+
+@app.after_request
+def add_cors_headers(response):
+    """Static CORS policy for frontend communication (any origin)"""
+    response.headers['Access-Control-Allow-Origin'] = '*'
+    response.headers['Access-Control-Allow-Headers'] = 'Content-Type'
+    response.headers['Access-Control-Allow-Methods'] = 'GET, POST, DELETE, OPTIONS'
+    return response
+
+
+# Store active games (uncapped: quantum games are only removed by DELETE)
+games: ShardedGameStore[QuantumBattleshipGame] = ShardedGameStore()
+
+# Serialized GET responses keyed by (game_id, view, state_version)
+_state_cache = ResponseCache(maxsize=4096)
+
+# Sample bomb circuits on Aer (in the worker pool) instead of computing them exactly
+SIMULATE_CIRCUITS = os.getenv('QUANTUM_SIMULATE', 'False').lower() == 'true'
+
+# Every possible 3-ship layout on the 5-cell grid (C(5,3) = 10), for auto-setup
+_SHIP_LAYOUTS = tuple(itertools.combinations(range(5), 3))
+
+# Validation error messages per failing field ('data' = missing fields)
+_SET_SHIPS_ERRORS = {
+    "data": "Missing required fields: player, positions",
+    "data.player": "Player must be 1 or 2",
+    "data.positions": "Must provide exactly 3 positions",
+    "data.positions[0]": "Positions must be integers 0-4",
+    "data.positions[1]": "Positions must be integers 0-4",
+    "data.positions[2]": "Positions must be integers 0-4"
+}
+
+_BOMB_ERRORS = {
+    "data": "Missing required fields: player, position",
+    "data.player": "Player must be 1 or 2",
+    "data.position": "Position must be 0-4"
+}
+
+
+def require_game(fn):
+    """
+    Look up the game named in the URL once and pass it to the view.
+
+    Wrapped views take (game_id, game, ...) and never see a missing game;
+    unknown IDs get the standard 404 body.
+    """
+    @wraps(fn)
+    def wrapper(game_id, *args, **kwargs):
+        game = games.get(game_id)
+        if game is None:
+            return j({
+                "success": False,
+                "message": "Game not found"
+            }, 404)
+        return fn(game_id, game, *args, **kwargs)
+    return wrapper
+
+
+def _new_game(game_id: str) -> QuantumBattleshipGame:
+    """Create a game whose simulated circuits run in the shared worker pool"""
+    return QuantumBattleshipGame(game_id, circuit_runner=run_rotations, simulate=SIMULATE_CIRCUITS)
+
+
+# Static response bodies, serialized once at import
+_HOME_JSON = dumps({
+    "message": "Quantum Battleship API - Hackathon Implementation",
+    "version": "1.0.0",
+    "description": "Based on Elitzur-Vaidman bomb tester experiment",
+    "game_rules": {
+        "grid_size": 5,
+        "ships_per_player": 3,
+        "win_condition": "All 3 opponent ships >95% damage"
+    },
+    "endpoints": {
+        "POST /api/quantum/game/new": "Create new quantum game",
+        "GET /api/quantum/game/<game_id>": "Get game state",
+        "POST /api/quantum/game/<game_id>/set-ships": "Set ship positions",
+        "POST /api/quantum/game/<game_id>/bomb": "Bomb a position (triggers quantum circuit)",
+        "GET /api/quantum/game/<game_id>/visualize": "Get damage visualization",
+        "GET /api/quantum/game/<game_id>/circuit": "Get a player's current quantum circuit diagram",
+        "POST /api/quantum/game/<game_id>/auto-setup": "Auto-setup ships for testing"
+    }
+})
+
+_QUANTUM_INFO_JSON = dumps({
+    "success": True,
+    "quantum_implementation": {
+        "concept": "Elitzur-Vaidman bomb tester",
+        "description": "Detect ships without directly hitting them using quantum interference",
+        "circuit_details": {
+            "qubits": 5,
+            "purpose": "One qubit per grid position (0-4)",
+            "gate_used": "RY (rotation around Y-axis)",
+            "measurement": "All 5 qubits measured"
+        },
+        "how_it_works": [
+            "1. Each grid position is represented by a qubit",
+            "2. When a bomb hits a ship position, apply RY rotation to that qubit",
+            "3. Multiple hits accumulate more rotations",
+            "4. Measure all qubits to get probabilities",
+            "5. Probability of |1⟩ represents damage to that position",
+            "6. Damage accumulates over rounds",
+            "7. Game ends when all 3 ships reach >95% damage"
+        ],
+        "quantum_advantage": "Quantum superposition and interference allow detection of ships through probability changes, simulating the bomb tester experiment"
+    }
+})
+
+# Backend that evaluates bomb circuits, as reported by the health check
+QUANTUM_BACKEND = "qiskit_aer_simulator" if SIMULATE_CIRCUITS else "analytic"
+
+# Only the game count varies; spliced into the pre-encoded body per request
+_HEALTH_JSON = (
+    b'{"status":"healthy","active_games":%%d,"quantum_backend":"%s"}' % QUANTUM_BACKEND.encode()
+)
 
 
 @app.route('/')
 def home():
     """API home endpoint"""
-    return jsonify({
-        "message": "Quantum Battleship API - Hackathon Implementation",
-        "version": "1.0.0",
-        "description": "Based on Elitzur-Vaidman bomb tester experiment",
-        "game_rules": {
-            "grid_size": 5,
-            "ships_per_player": 3,
-            "win_condition": "All 3 opponent ships >95% damage"
-        },
-        "endpoints": {
-            "POST /api/quantum/game/new": "Create new quantum game",
-            "GET /api/quantum/game/<game_id>": "Get game state",
-            "POST /api/quantum/game/<game_id>/set-ships": "Set ship positions",
-            "POST /api/quantum/game/<game_id>/bomb": "Bomb a position (triggers quantum circuit)",
-            "GET /api/quantum/game/<game_id>/visualize": "Get damage visualization",
-            "POST /api/quantum/game/<game_id>/auto-setup": "Auto-setup ships for testing"
-        }
-    })
+    return raw(_HOME_JSON)
 
 
 @app.route('/api/quantum/game/new', methods=['POST'])
@@ -50,22 +155,21 @@ def create_quantum_game():
         "game_id": "custom-id"  // Optional custom game ID
     }
     """
-    data = request.get_json() or {}
+    data = read_json() or {}
 
     # Generate or use custom game ID
-    game_id = data.get('game_id', str(uuid.uuid4()))
+    game_id = data['game_id'] if 'game_id' in data else next_uuid()
+
+    # Create new quantum game (atomic check-and-insert)
+    game = games.create_if_absent(game_id, lambda: _new_game(game_id))
 
-    if game_id in games:
-        return jsonify({
+    if game is None:
+        return j({
             "success": False,
             "message": "Game ID already exists"
-        }), 400
-
-    # Create new quantum game
-    game = QuantumBattleshipGame(game_id)
-    games[game_id] = game
+        }, 400)
 
-    return jsonify({
+    return j({
         "success": True,
         "message": "Quantum game created",
         "game_id": game_id,
@@ -74,36 +178,39 @@ def create_quantum_game():
             "ships_per_player": game.ships_per_player,
             "instructions": "Each player must place 3 ships on positions 0-4"
         }
-    }), 201
+    }, 201)
 
 
 @app.route('/api/quantum/game/<game_id>', methods=['GET'])
-def get_quantum_game_state(game_id):
+@require_game
+def get_quantum_game_state(game_id, game):
     """
     Get current game state.
 
     Query params:
     - view: 0 (full), 1 (player1), 2 (player2)
     """
-    if game_id not in games:
-        return jsonify({
-            "success": False,
-            "message": "Game not found"
-        }), 404
-
-    game = games[game_id]
     view = int(request.args.get('view', 0))
 
-    state = game.get_game_state(player_view=view)
+    # Read the version before building the body so a concurrent bomb can
+    # only make the cached entry newer than its key, never older
+    key = (game_id, view, game.state_version)
+    body = _state_cache.get(key)
 
-    return jsonify({
-        "success": True,
-        "state": state
-    })
+    if body is None:
+        state = game.get_game_state(player_view=view)
+        body = dumps({
+            "success": True,
+            "state": state
+        })
+        _state_cache.put(key, body)
+
+    return raw(body)
 
 
 @app.route('/api/quantum/game/<game_id>/set-ships', methods=['POST'])
-def set_ship_positions(game_id):
+@require_game
+def set_ship_positions(game_id, game):
     """
     Set ship positions for a player.
 
@@ -113,47 +220,29 @@ def set_ship_positions(game_id):
         "positions": [0, 2, 4]  // 3 unique positions from 0-4
     }
     """
-    if game_id not in games:
-        return jsonify({
-            "success": False,
-            "message": "Game not found"
-        }), 404
-
-    game = games[game_id]
-    data = request.get_json()
+    data = read_json()
 
-    if not data or 'player' not in data or 'positions' not in data:
-        return jsonify({
+    # Validate input
+    error = check(validate_set_ships, data, _SET_SHIPS_ERRORS)
+    if error:
+        return j({
             "success": False,
-            "message": "Missing required fields: player, positions"
-        }), 400
+            "message": error
+        }, 400)
 
     player = data['player']
     positions = data['positions']
 
-    # Validate input
-    if player not in [1, 2]:
-        return jsonify({
-            "success": False,
-            "message": "Player must be 1 or 2"
-        }), 400
-
-    if not isinstance(positions, list) or len(positions) != 3:
-        return jsonify({
-            "success": False,
-            "message": "Must provide exactly 3 positions"
-        }), 400
-
     # Set ship positions
     success = game.setShipPosition(player, positions)
 
     if not success:
-        return jsonify({
+        return j({
             "success": False,
             "message": "Invalid positions. Must be 3 unique values from 0-4"
-        }), 400
+        }, 400)
 
-    return jsonify({
+    return j({
         "success": True,
         "message": f"Player {player} ships placed at positions {positions}",
         "player": player,
@@ -162,7 +251,8 @@ def set_ship_positions(game_id):
 
 
 @app.route('/api/quantum/game/<game_id>/bomb', methods=['POST'])
-def bomb_position(game_id):
+@require_game
+def bomb_position(game_id, game):
     """
     Bomb a position on opponent's grid.
     This triggers the quantum circuit and measurement.
@@ -173,105 +263,105 @@ def bomb_position(game_id):
         "position": 0-4
     }
     """
-    if game_id not in games:
-        return jsonify({
-            "success": False,
-            "message": "Game not found"
-        }), 404
-
-    game = games[game_id]
-    data = request.get_json()
+    data = read_json()
 
-    if not data or 'player' not in data or 'position' not in data:
-        return jsonify({
+    # Validate
+    error = check(validate_bomb, data, _BOMB_ERRORS)
+    if error:
+        return j({
             "success": False,
-            "message": "Missing required fields: player, position"
-        }), 400
+            "message": error
+        }, 400)
 
     player = data['player']
     position = data['position']
 
-    # Validate
-    if player not in [1, 2]:
-        return jsonify({
-            "success": False,
-            "message": "Player must be 1 or 2"
-        }), 400
-
-    if not isinstance(position, int) or position < 0 or position >= 5:
-        return jsonify({
-            "success": False,
-            "message": "Position must be 0-4"
-        }), 400
-
     # Execute bomb (runs quantum circuit)
     result = game.bombShip(player, position)
 
     if not result["success"]:
-        return jsonify(result), 400
+        return j(result, 400)
 
     # Add visualization
     opponent = 2 if player == 1 else 1
     result["damage_visualization"] = game.visualize_damage_map(opponent)
 
-    return jsonify(result)
+    return j(result)
 
 
 @app.route('/api/quantum/game/<game_id>/visualize', methods=['GET'])
-def visualize_game(game_id):
+@require_game
+def visualize_game(game_id, game):
     """
     Get damage visualization for both players.
 
     Query params:
     - player: 1, 2, or 'both' (default)
     """
-    if game_id not in games:
-        return jsonify({
-            "success": False,
-            "message": "Game not found"
-        }), 404
-
-    game = games[game_id]
     player_param = request.args.get('player', 'both')
 
-    visualization = {}
+    key = (game_id, 'visualize:' + player_param, game.state_version)
+    body = _state_cache.get(key)
+
+    if body is None:
+        visualization = {}
+
+        if player_param in ['1', 'both']:
+            visualization['player1'] = game.visualize_damage_map(1)
+
+        if player_param in ['2', 'both']:
+            visualization['player2'] = game.visualize_damage_map(2)
+
+        body = dumps({
+            "success": True,
+            "visualization": visualization,
+            "game_state": game.get_game_state(0)
+        })
+        _state_cache.put(key, body)
+
+    return raw(body)
+
+
+@app.route('/api/quantum/game/<game_id>/circuit', methods=['GET'])
+@require_game
+def get_circuit(game_id, game):
+    """
+    Get the text diagram of the circuit behind a player's latest bomb.
 
-    if player_param in ['1', 'both']:
-        visualization['player1'] = game.visualize_damage_map(1)
+    Query params:
+    - player: 1 (default) or 2
+    """
+    player_param = request.args.get('player', '1')
+    if player_param not in ('1', '2'):
+        return j({
+            "success": False,
+            "message": "Player must be 1 or 2"
+        }, 400)
 
-    if player_param in ['2', 'both']:
-        visualization['player2'] = game.visualize_damage_map(2)
+    player = int(player_param)
 
-    return jsonify({
+    return j({
         "success": True,
-        "visualization": visualization,
-        "game_state": game.get_game_state(0)
+        "player": player,
+        "circuit": game.draw_circuit(player)
     })
 
 
 @app.route('/api/quantum/game/<game_id>/auto-setup', methods=['POST'])
-def auto_setup_game(game_id):
+@require_game
+def auto_setup_game(game_id, game):
     """
     Automatically setup ships for both players (for testing).
     Randomly places 3 ships for each player.
     """
-    if game_id not in games:
-        return jsonify({
-            "success": False,
-            "message": "Game not found"
-        }), 404
-
-    game = games[game_id]
-
-    # Generate random unique positions for player 1
-    player1_positions = random.sample(range(5), 3)
+    # Pick a random layout of unique positions for each player
+    player1_positions = random.choice(_SHIP_LAYOUTS)
     game.setShipPosition(1, player1_positions)
 
-    # Generate random unique positions for player 2
-    player2_positions = random.sample(range(5), 3)
+    player2_positions = random.choice(_SHIP_LAYOUTS)
     game.setShipPosition(2, player2_positions)
 
-    return jsonify({
+    return j({
         "success": True,
         "message": "Ships auto-placed for both players",
         "player1_ships": player1_positions,
@@ -281,55 +371,26 @@ def auto_setup_game(game_id):
 
 
 @app.route('/api/quantum/game/<game_id>/quantum-info', methods=['GET'])
-def get_quantum_info(game_id):
+@require_game
+def get_quantum_info(game_id, game):
     """
     Get information about the quantum circuit implementation.
     Educational endpoint to explain the quantum mechanics.
     """
-    if game_id not in games:
-        return jsonify({
-            "success": False,
-            "message": "Game not found"
-        }), 404
-
-    return jsonify({
-        "success": True,
-        "quantum_implementation": {
-            "concept": "Elitzur-Vaidman bomb tester",
-            "description": "Detect ships without directly hitting them using quantum interference",
-            "circuit_details": {
-                "qubits": 5,
-                "purpose": "One qubit per grid position (0-4)",
-                "gate_used": "RY (rotation around Y-axis)",
-                "measurement": "All 5 qubits measured"
-            },
-            "how_it_works": [
-                "1. Each grid position is represented by a qubit",
-                "2. When a bomb hits a ship position, apply RY rotation to that qubit",
-                "3. Multiple hits accumulate more rotations",
-                "4. Measure all qubits to get probabilities",
-                "5. Probability of |1⟩ represents damage to that position",
-                "6. Damage accumulates over rounds",
-                "7. Game ends when all 3 ships reach >95% damage"
-            ],
-            "quantum_advantage": "Quantum superposition and interference allow detection of ships through probability changes, simulating the bomb tester experiment"
-        }
-    })
+    return raw(_QUANTUM_INFO_JSON)
 
 
 @app.route('/api/quantum/game/<game_id>/reset', methods=['POST'])
 def reset_quantum_game(game_id):
     """Reset a quantum game to initial state"""
-    if game_id not in games:
-        return jsonify({
+    # Create new game with same ID
+    if games.replace(game_id, lambda: _new_game(game_id)) is None:
+        return j({
             "success": False,
             "message": "Game not found"
-        }), 404
-
-    # Create new game with same ID
-    games[game_id] = QuantumBattleshipGame(game_id)
+        }, 404)
 
-    return jsonify({
+    return j({
         "success": True,
         "message": "Game reset successfully"
     })
@@ -338,15 +399,13 @@ def reset_quantum_game(game_id):
 @app.route('/api/quantum/game/<game_id>', methods=['DELETE'])
 def delete_quantum_game(game_id):
     """Delete a quantum game"""
-    if game_id not in games:
-        return jsonify({
+    if games.pop(game_id) is None:
+        return j({
             "success": False,
             "message": "Game not found"
-        }), 404
+        }, 404)
 
-    del games[game_id]
-
-    return jsonify({
+    return j({
         "success": True,
         "message": "Game deleted successfully"
     })
@@ -355,41 +414,42 @@ def delete_quantum_game(game_id):
 @app.route('/api/quantum/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
-    return jsonify({
-        "status": "healthy",
-        "active_games": len(games),
-        "quantum_backend": "qiskit_aer_simulator"
-    })
+    return raw(_HEALTH_JSON % len(games))
 
 
 @app.errorhandler(404)
 def not_found(error):
-    return jsonify({
+    return j({
         "success": False,
         "message": "Endpoint not found"
-    }), 404
+    }, 404)
 
 
 @app.errorhandler(500)
 def internal_error(error):
-    return jsonify({
+    return j({
         "success": False,
         "message": "Internal server error"
-    }), 500
+    }, 500)
 
 
 if __name__ == '__main__':
-    print("=" * 60)
-    print(" Quantum Battleship Server - Hackathon Implementation")
-    print("   Based on Elitzur-Vaidman bomb tester experiment")
-    print("=" * 60)
-    print("\n Server starting on http://localhost:5000")
-    print(" API documentation available at http://localhost:5000/")
-    print("\n  Quantum Features:")
-    print("   • 5-qubit quantum circuit")
-    print("   • Elitzur-Vaidman bomb tester principle")
-    print("   • Ship detection through quantum interference")
-    print("   • Damage calculation from quantum measurements")
-    print("\n" + "=" * 60 + "\n")
-
-    app.run(debug=True, host='0.0.0.0', port=5001)
\ No newline at end of file
+    sys.stdout.write("\n".join([
+        "=" * 60,
+        " Quantum Battleship Server - Hackathon Implementation",
+        "   Based on Elitzur-Vaidman bomb tester experiment",
+        "=" * 60,
+        "\n Server starting on http://localhost:5000",
+        " API documentation available at http://localhost:5000/",
+        "\n  Quantum Features:",
+        "   • 5-qubit quantum circuit",
+        "   • Elitzur-Vaidman bomb tester principle",
+        "   • Ship detection through quantum interference",
+        "   • Damage calculation from quantum measurements",
+        "\n" + "=" * 60 + "\n",
+        " Development server only - for production use:",
+        "   gunicorn -c gunicorn_config.py wsgi:app\n\n"
+    ]))
+    sys.stdout.flush()
+
+    app.run(debug=True, host='0.0.0.0', port=5001)
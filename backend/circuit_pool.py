@@ -0,0 +1,91 @@
+"""
+Process pool for quantum circuit execution
+Runs the bomb-tester circuit off the Flask request thread, on the same
+template and simulator the in-process path uses, built once per worker
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+NUM_QUBITS = 5  # One qubit per grid position
+SHOTS = 1024
+TIMEOUT = 30  # Seconds to wait for a worker before failing the request
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+# Per-worker state, built once by _init_worker
+_simulator = None
+_template = None
+_bits = None
+
+
+def _init_worker():
+    """Import Qiskit Aer and transpile the parameterized circuit once per worker"""
+    global _simulator, _template, _bits
+
+    from quantum_battleship_core import _shared_simulator, _bomb_circuit_template, _outcome_bits
+
+    # Single-threaded (SIMULATOR_OPTIONS); the pool supplies the parallelism
+    _simulator = _shared_simulator()
+    _template = _bomb_circuit_template(NUM_QUBITS)
+    _bits = _outcome_bits(NUM_QUBITS)
+
+
+def _run(angle_sets: Sequence[Tuple[float, ...]], shots: int) -> List[Tuple[Dict[str, int], np.ndarray]]:
+    """Bind every set of RY angles into the template and sample them as one job (runs in a worker)"""
+    # Aer binds the values itself; no bound copies of the template are built
+    values = np.array(angle_sets).T.tolist()
+    binds = dict(zip(_template.parameters, values))
+    result = _simulator.run(_template, parameter_binds=[binds], shots=shots).result()
+
+    # Per-qubit |1⟩ probabilities, marginalized from the saved outcome probabilities
+    return [
+        (dict(result.get_counts(i)), result.data(i)['probabilities'] @ _bits)
+        for i in range(len(angle_sets))
+    ]
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    # Created on first use so a preloading server master never forks with a
+    # live pool; spawn because Aer's OpenMP runtime is not fork-safe
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ProcessPoolExecutor(
+                    max_workers=os.cpu_count(),
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_worker
+                )
+    return _executor
+
+
+def run_rotations(
+        angle_sets: Sequence[Tuple[float, ...]],
+        shots: int = SHOTS
+) -> List[Tuple[Dict[str, int], np.ndarray]]:
+    """
+    Run the 5-qubit RY circuit in the worker pool, once per set of angles.
+
+    All sets go to a single worker as one simulator job, so a batch of bombs
+    costs one round trip to the pool.
+
+    Args:
+        angle_sets: Total RY rotation for each qubit, one tuple per circuit
+        shots: Number of measurement shots per circuit
+
+    Returns:
+        One (measurement counts keyed by bitstring with qubit 0 rightmost,
+        exact probability of |1⟩ per qubit) pair per set of angles
+    """
+    for angles in angle_sets:
+        if len(angles) != NUM_QUBITS:
+            raise ValueError(f"Expected {NUM_QUBITS} angles, got {len(angles)}")
+
+    future = _get_executor().submit(_run, list(angle_sets), shots)
+    return future.result(timeout=TIMEOUT)
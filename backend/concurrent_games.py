@@ -0,0 +1,132 @@
+"""
+Thread-safe game storage for the Flask APIs
+Lock-striped dictionary so concurrent requests never race on the games map
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Callable, Generic, List, Optional, Tuple, TypeVar
+
+V = TypeVar('V')
+
+NUM_SHARDS = 16  # Must stay a power of two (bucket index is a bit mask)
+
+DEFAULT_MAX_GAMES = 10_000  # Active-game cap used by GameManager
+
+
+class ShardedGameStore(Generic[V]):
+    """
+    Dictionary of active games split into independently locked buckets.
+
+    Single lookups are plain dict reads; every read-modify-write sequence
+    (create, replace, pop) runs under the owning bucket's lock so two
+    requests for the same game ID can never interleave.
+
+    With a maxsize, each bucket keeps its games in LRU order and evicts the
+    least recently used one once it holds more than maxsize / NUM_SHARDS,
+    so the store as a whole never exceeds maxsize. The cap is per bucket,
+    not global: a bucket that fills up evicts even while others have room,
+    so eviction can start before the total reaches maxsize. Lookups then
+    take the bucket lock to record the access.
+    """
+
+    def __init__(
+            self,
+            maxsize: Optional[int] = None,
+            on_evict: Optional[Callable[[str, V], None]] = None
+    ):
+        """
+        Args:
+            maxsize: Maximum number of games kept; None for unbounded
+            on_evict: Called with (game_id, game) for every evicted game,
+                outside the bucket lock
+        """
+        self.maxsize = maxsize
+        self.on_evict = on_evict
+        self._shard_capacity = None if maxsize is None else max(1, maxsize // NUM_SHARDS)
+        self._buckets: Tuple[Tuple[threading.Lock, "OrderedDict[str, V]"], ...] = tuple(
+            (threading.Lock(), OrderedDict()) for _ in range(NUM_SHARDS)
+        )
+
+    def _bucket(self, game_id: str) -> Tuple[threading.Lock, "OrderedDict[str, V]"]:
+        return self._buckets[hash(game_id) & (NUM_SHARDS - 1)]
+
+    def _trim(self, bucket: "OrderedDict[str, V]") -> List[Tuple[str, V]]:
+        """Drop least recently used entries over capacity (caller holds the lock)"""
+        evicted = []
+        if self._shard_capacity is not None:
+            while len(bucket) > self._shard_capacity:
+                evicted.append(bucket.popitem(last=False))
+        return evicted
+
+    def _notify(self, evicted: List[Tuple[str, V]]):
+        if self.on_evict is not None:
+            for game_id, value in evicted:
+                self.on_evict(game_id, value)
+
+    def get(self, game_id: str) -> Optional[V]:
+        """Return the stored game or None"""
+        lock, bucket = self._bucket(game_id)
+        if self._shard_capacity is None:
+            return bucket.get(game_id)
+
+        with lock:
+            value = bucket.get(game_id)
+            if value is not None:
+                bucket.move_to_end(game_id)
+            return value
+
+    def put(self, game_id: str, value: V):
+        """Store a game, overwriting any existing entry"""
+        lock, bucket = self._bucket(game_id)
+        with lock:
+            bucket[game_id] = value
+            bucket.move_to_end(game_id)
+            evicted = self._trim(bucket)
+        self._notify(evicted)
+
+    def create_if_absent(self, game_id: str, factory: Callable[[], V]) -> Optional[V]:
+        """
+        Atomically create a game if the ID is free.
+
+        Returns:
+            The new game, or None if the ID was already taken
+        """
+        lock, bucket = self._bucket(game_id)
+        with lock:
+            if game_id in bucket:
+                return None
+            value = factory()
+            bucket[game_id] = value
+            evicted = self._trim(bucket)
+        self._notify(evicted)
+        return value
+
+    def replace(self, game_id: str, factory: Callable[[], V]) -> Optional[V]:
+        """
+        Atomically replace an existing game with a fresh one.
+
+        Returns:
+            The new game, or None if no game with this ID exists
+        """
+        lock, bucket = self._bucket(game_id)
+        with lock:
+            if game_id not in bucket:
+                return None
+            value = factory()
+            bucket[game_id] = value
+            bucket.move_to_end(game_id)
+            return value
+
+    def pop(self, game_id: str) -> Optional[V]:
+        """Remove and return a game, or None if it does not exist"""
+        lock, bucket = self._bucket(game_id)
+        with lock:
+            return bucket.pop(game_id, None)
+
+    def __contains__(self, game_id: str) -> bool:
+        return game_id in self._bucket(game_id)[1]
+
+    def __len__(self) -> int:
+        # Lock-free: each len() is atomic, the total is a snapshot
+        return sum(len(bucket) for _, bucket in self._buckets)
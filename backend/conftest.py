@@ -0,0 +1,7 @@
+"""
+Pytest configuration for the backend
+Skips the scripts that drive a live server over HTTP
+"""
+
+# Run by hand against a running server (python test_quantum.py), not by pytest
+collect_ignore = ["test_quantum.py", "test_quantum_api.py"]
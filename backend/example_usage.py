@@ -5,6 +5,7 @@ Demonstrates the hackathon implementation step-by-step
 
 from quantum_battleship_core import QuantumBattleshipGame
 import json
+import sys
 
 
 def print_section(title):
@@ -163,28 +164,35 @@ def example_3_game_to_completion():
         opponent = 2 if player == 1 else 1
         hit_marker = "💥 HIT" if result['hit_ship'] else "💨 MISS"
 
-        print(f"Round {round_num}: Player {player} → Position {position} {hit_marker}")
+        # Collect the round's output and write it in one call
+        lines = [f"Round {round_num}: Player {player} → Position {position} {hit_marker}"]
 
         # Show ship damage after each round
         damage_info = result['damage_results']['ship_damage']
         destroyed = result['damage_results']['destroyed_ships']
 
-        print(f"   Player {opponent} ship damage: ", end="")
-        for ship_pos, dmg in damage_info.items():
-            destroyed_marker = " [DESTROYED]" if int(ship_pos) in destroyed else ""
-            print(f"Pos {ship_pos}: {dmg:.1f}%{destroyed_marker} | ", end="")
-        print()
+        damage_line = "".join(
+            f"Pos {ship_pos}: {dmg:.1f}%{' [DESTROYED]' if int(ship_pos) in destroyed else ''} | "
+            for ship_pos, dmg in damage_info.items()
+        )
+        lines.append(f"   Player {opponent} ship damage: {damage_line}")
 
         if result['game_over']:
-            print(f"\n{'=' * 70}")
-            print(f" GAME OVER!")
-            print(f"🏆 Winner: Player {result['winner']}")
-            print(f"{'=' * 70}")
-            print("\nFinal Damage Maps:")
-            print(game.visualize_damage_map(1))
-            print(game.visualize_damage_map(2))
+            lines += [
+                f"\n{'=' * 70}",
+                f" GAME OVER!",
+                f"🏆 Winner: Player {result['winner']}",
+                f"{'=' * 70}",
+                "\nFinal Damage Maps:",
+                game.visualize_damage_map(1),
+                game.visualize_damage_map(2)
+            ]
+            sys.stdout.write("\n".join(lines) + "\n")
             break
-        print()
+
+        sys.stdout.write("\n".join(lines) + "\n\n")
+
+    sys.stdout.flush()
 
 
 def example_4_serialization():
@@ -203,14 +211,15 @@ def example_4_serialization():
     # Convert to dictionary
     game_dict = game.to_dict()
 
+    # Damage vectors are numpy arrays; list them for the standard json module
     print("Game state as dictionary:")
-    print(json.dumps(game_dict, indent=2))
+    print(json.dumps(game_dict, indent=2, default=lambda obj: obj.tolist()))
 
     # Get player-specific views
     print("\n" + "-" * 70)
     print("Player 1's view (can see own ships):")
     player1_view = game.get_game_state(player_view=1)
-    print(json.dumps(player1_view, indent=2))
+    print(json.dumps(player1_view, indent=2, default=lambda obj: obj.tolist()))
 
 
 def example_5_validation():
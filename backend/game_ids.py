@@ -0,0 +1,35 @@
+"""
+Game ID generation for the Flask APIs
+Random UUIDs drawn from a pool refilled with one os.urandom call per batch
+"""
+
+import collections
+import os
+import threading
+import uuid
+
+BATCH_SIZE = 256
+
+# Starts empty and fills on first use, so workers forked from a preloading
+# master never share IDs
+_pool = collections.deque()
+_refill_lock = threading.Lock()
+
+
+def _refill():
+    data = os.urandom(16 * BATCH_SIZE)
+    _pool.extend(
+        str(uuid.UUID(bytes=data[i:i + 16], version=4))
+        for i in range(0, len(data), 16)
+    )
+
+
+def next_uuid() -> str:
+    """Return a random version-4 UUID string (same format as str(uuid.uuid4()))"""
+    while True:
+        try:
+            return _pool.popleft()
+        except IndexError:
+            with _refill_lock:
+                if not _pool:
+                    _refill()
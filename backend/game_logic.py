@@ -3,36 +3,95 @@ Game Logic for Quantum Battleship
 Handles game setup, ship placement, and turn management
 """
 
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 import random
-from models import Game, GameBoard, Ship, ShipType, Orientation
+from models import Game, GameBoard, Ship, ShipType, Orientation, placement_masks
 from quantum_ai import QuantumAI, QuantumShipPlacer
+from concurrent_games import ShardedGameStore, DEFAULT_MAX_GAMES
+
+# Standard ship configuration, placed in this order
+FLEET = (
+    ShipType.CARRIER,
+    ShipType.BATTLESHIP,
+    ShipType.CRUISER,
+    ShipType.SUBMARINE,
+    ShipType.DESTROYER
+)
+
+# Full-board restarts setup_ai_board tries before giving up
+MAX_SETUP_ATTEMPTS = 10
+
+
+def _placements_by_length(size: int) -> Dict[int, List[Tuple[int, Tuple[int, int], Orientation]]]:
+    """Group every legal (mask, start_pos, orientation) on the board by ship length"""
+    placements: Dict[int, List[Tuple[int, Tuple[int, int], Orientation]]] = {}
+    for (length, x, y, orientation), mask in placement_masks(size).items():
+        placements.setdefault(length, []).append((mask, (x, y), orientation))
+    return placements
+
+
+# Every legal placement on the 10x10 board, by ship length
+_PLACEMENTS = _placements_by_length(10)
+
+
+def random_placement(ship_type: ShipType, occupied_mask: int) -> Optional[Tuple[Tuple[int, int], Orientation]]:
+    """
+    Pick a uniformly random placement that does not overlap occupied cells.
+
+    Equivalent to rejection-sampling random (x, y, orientation) until one
+    fits, without the retries.
+
+    Args:
+        ship_type: Ship to place
+        occupied_mask: Board bitmask of cells already holding ships
+
+    Returns:
+        (start_pos, orientation), or None if the ship cannot fit anywhere
+    """
+    candidates = [p for p in _PLACEMENTS[ship_type.length] if not p[0] & occupied_mask]
+    if not candidates:
+        return None
+    _, start_pos, orientation = random.choice(candidates)
+    return start_pos, orientation
 
 
 class GameManager:
     """Manages game state and operations"""
 
     def __init__(self):
-        self.games = {}  # Dictionary to store active games
-        self.quantum_ai = {}  # Dictionary to store AI instances per game
+        # Active games, least recently used evicted past the cap (with their AI)
+        self.games: ShardedGameStore[Game] = ShardedGameStore(
+            maxsize=DEFAULT_MAX_GAMES,
+            on_evict=lambda game_id, _: self.quantum_ai.pop(game_id)
+        )
+        self.quantum_ai: ShardedGameStore[QuantumAI] = ShardedGameStore()  # AI instance per game
 
     def create_game(self, game_id: str, player_name: str = "Player") -> Game:
         """Create a new game instance"""
         game = Game(game_id, player_name)
-        self.games[game_id] = game
-        self.quantum_ai[game_id] = QuantumAI(board_size=10)
+        self.quantum_ai.put(game_id, QuantumAI(board_size=10))
+        self.games.put(game_id, game)
         return game
 
     def get_game(self, game_id: str) -> Optional[Game]:
         """Retrieve a game by ID"""
         return self.games.get(game_id)
 
+    def pop_game(self, game_id: str) -> Optional[Game]:
+        """
+        Remove a game and its AI in one step.
+
+        Returns:
+            The removed game, or None if it did not exist
+        """
+        game = self.games.pop(game_id)
+        if game is not None:
+            self.quantum_ai.pop(game_id)
+        return game
+
     def delete_game(self, game_id: str):
         """Delete a game instance"""
-        if game_id in self.games:
-            del self.games[game_id]
-        if game_id in self.quantum_ai:
-            del self.quantum_ai[game_id]
+        self.pop_game(game_id)
 
     def setup_ai_board(self, game_id: str, use_quantum: bool = True) -> bool:
         """
@@ -44,43 +103,51 @@ class GameManager:
             return False
 
         ai_board = game.ai_board
+        placer = QuantumShipPlacer(board_size=10) if use_quantum else None
+
+        for _ in range(MAX_SETUP_ATTEMPTS):
+            if self._place_fleet(ai_board, placer):
+                game.bump_version()
+                return True
 
-        if use_quantum:
-            placer = QuantumShipPlacer(board_size=10)
+            # Some ship had no legal placement left; start over on an empty board
+            ai_board.clear()
 
-        # Standard ship configuration
-        ship_types = [
-            ShipType.CARRIER,
-            ShipType.BATTLESHIP,
-            ShipType.CRUISER,
-            ShipType.SUBMARINE,
-            ShipType.DESTROYER
-        ]
+        # Out of attempts: the board is left empty, and cached state must show it
+        game.bump_version()
+        return False
 
-        for ship_type in ship_types:
+    def _place_fleet(self, board: GameBoard, placer: Optional[QuantumShipPlacer]) -> bool:
+        """
+        Place the standard fleet on a board.
+
+        Each ship first gets up to 100 quantum placer draws (when a placer is
+        given), then falls back to sampling the legal placements directly.
+
+        Returns:
+            True if every ship was placed, False if one could not fit anywhere
+        """
+        for ship_type in FLEET:
             placed = False
-            attempts = 0
-            max_attempts = 100
 
-            while not placed and attempts < max_attempts:
-                if use_quantum:
+            if placer is not None:
+                attempts = 0
+                max_attempts = 100
+
+                while not placed and attempts < max_attempts:
                     start_pos, orientation_str = placer.quantum_random_placement(ship_type.length)
                     orientation = Orientation.HORIZONTAL if orientation_str == "horizontal" else Orientation.VERTICAL
-                else:
-                    # Classical random placement
-                    x = random.randint(0, 9)
-                    y = random.randint(0, 9)
-                    start_pos = (x, y)
-                    orientation = random.choice([Orientation.HORIZONTAL, Orientation.VERTICAL])
 
-                ship = Ship(ship_type, start_pos, orientation)
-                placed = ai_board.place_ship(ship)
-                attempts += 1
+                    ship = Ship(ship_type, start_pos, orientation)
+                    placed = board.place_ship(ship)
+                    attempts += 1
 
             if not placed:
-                # Reset and try again
-                game.ai_board = GameBoard()
-                return self.setup_ai_board(game_id, use_quantum)
+                # Classical placement: sample straight from the legal placements
+                placement = random_placement(ship_type, board.ship_mask)
+                if placement is None:
+                    return False
+                board.place_ship(Ship(ship_type, *placement))
 
         return True
 
@@ -108,6 +175,7 @@ class GameManager:
 
         # Try to place ship
         if game.player_board.place_ship(ship):
+            game.bump_version()
             return {
                 "success": True,
                 "message": f"{ship_type.ship_name} placed successfully",
@@ -136,6 +204,7 @@ class GameManager:
 
         # Process shot
         result = game.ai_board.receive_shot((x, y))
+        game.bump_version()
 
         # Check if game is over
         game.check_game_over()
@@ -174,6 +243,7 @@ class GameManager:
 
         # Process shot
         result = game.player_board.receive_shot(target)
+        game.bump_version()
 
         # Update AI based on result
         ai.process_shot_result(target, result)
@@ -204,29 +274,14 @@ class GameManager:
             return {"success": False, "message": "Game not found"}
 
         # Reset player board
-        game.player_board = GameBoard()
+        game.player_board.clear()
 
-        ship_types = [
-            ShipType.CARRIER,
-            ShipType.BATTLESHIP,
-            ShipType.CRUISER,
-            ShipType.SUBMARINE,
-            ShipType.DESTROYER
-        ]
+        for ship_type in FLEET:
+            placement = random_placement(ship_type, game.player_board.ship_mask)
+            if placement is not None:
+                game.player_board.place_ship(Ship(ship_type, *placement))
 
-        for ship_type in ship_types:
-            placed = False
-            attempts = 0
-            max_attempts = 100
-
-            while not placed and attempts < max_attempts:
-                x = random.randint(0, 9)
-                y = random.randint(0, 9)
-                orientation = random.choice([Orientation.HORIZONTAL, Orientation.VERTICAL])
-
-                ship = Ship(ship_type, (x, y), orientation)
-                placed = game.player_board.place_ship(ship)
-                attempts += 1
+        game.bump_version()
 
         return {
             "success": True,
@@ -234,16 +289,29 @@ class GameManager:
             "board": game.player_board.to_dict(hide_ships=False)
         }
 
+    def reset_if_present(self, game_id: str) -> bool:
+        """
+        Reset a game to initial state if it exists.
+
+        Returns:
+            True if the game was reset, False if it does not exist
+        """
+        game = self.get_game(game_id)
+        if game is None:
+            return False
+
+        game.player_board.clear()
+        game.ai_board.clear()
+        game.current_turn = "player"
+        game.game_over = False
+        game.winner = None
+        game.bump_version()
+        self.quantum_ai.put(game_id, QuantumAI(board_size=10))
+        return True
+
     def reset_game(self, game_id: str):
         """Reset a game to initial state"""
-        game = self.get_game(game_id)
-        if game:
-            game.player_board = GameBoard()
-            game.ai_board = GameBoard()
-            game.current_turn = "player"
-            game.game_over = False
-            game.winner = None
-            self.quantum_ai[game_id] = QuantumAI(board_size=10)
+        self.reset_if_present(game_id)
 
 
 # Global game manager instance
@@ -0,0 +1,24 @@
+"""
+Gunicorn configuration for the Quantum Battleship backend
+
+Usage: gunicorn -c gunicorn_config.py wsgi:app
+"""
+
+import os
+
+bind = f"{os.getenv('HOST', '0.0.0.0')}:{os.getenv('PORT', '5001')}"
+
+# Active games live in process memory, so every request for a game has to
+# reach the worker that created it; that is why the default is one worker.
+# The trade-off: gevent only overlaps I/O, so within that worker CPU-bound
+# work (quantum bomb evaluation, AI moves, rendering) runs one request at a
+# time. With QUANTUM_SIMULATE=true the Aer runs themselves move to the
+# circuit_pool processes. To use every core, route requests stickily by game
+# ID and set WEB_CONCURRENCY (e.g. to the CPU count).
+workers = int(os.getenv('WEB_CONCURRENCY', 1))
+worker_class = 'gevent'
+worker_connections = 1000
+
+# Import the app once in the master so module-level data (precomputed JSON
+# bodies, lookup tables) is built once and shared copy-on-write with workers.
+preload_app = True
@@ -0,0 +1,43 @@
+"""
+JSON helpers for the Flask APIs
+orjson-based replacements for flask.jsonify and request.get_json
+"""
+
+from flask import Response, request
+import orjson
+
+# Numpy arrays/scalars are encoded natively; int dict keys (e.g. ship_damage)
+# are stringified the same way jsonify did
+JSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def dumps(obj) -> bytes:
+    """Serialize an object to JSON bytes"""
+    return orjson.dumps(obj, option=JSON_OPTIONS)
+
+
+def raw(body: bytes, status: int = 200) -> Response:
+    """Wrap an already-serialized JSON body in a response"""
+    return Response(body, status=status, mimetype='application/json')
+
+
+def j(obj, status: int = 200) -> Response:
+    """Serialize an object into a JSON response"""
+    return raw(dumps(obj), status)
+
+
+def read_json():
+    """
+    Decode the request body with orjson.
+
+    Returns:
+        The decoded payload, {} for an empty body, or None if the body
+        is not valid JSON
+    """
+    body = request.get_data(cache=False)
+    if not body:
+        return {}
+    try:
+        return orjson.loads(body)
+    except orjson.JSONDecodeError:
+        return None
@@ -0,0 +1,76 @@
+"""
+Numeric kernels for the Quantum AI probability map and quantum damage
+JIT-compiled with Numba when it is installed, plain numpy otherwise
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional
+    njit = None
+
+HAVE_NUMBA = njit is not None
+
+
+if HAVE_NUMBA:
+    @njit(cache=True, fastmath=True)
+    def zero_shot_cells(pm, shots):
+        """Set the weight of every shot cell to 0 (in place)"""
+        rows, cols = pm.shape
+        for i in range(rows):
+            for j in range(cols):
+                if shots[i, j]:
+                    pm[i, j] = 0.0
+
+    @njit(cache=True, fastmath=True)
+    def scale_neighborhood(pm, x, y, radius, factor):
+        """Multiply the cells within radius of (x, y) by factor, clipped to the board (in place)"""
+        rows, cols = pm.shape
+        for i in range(max(0, x - radius), min(rows, x + radius + 1)):
+            for j in range(max(0, y - radius), min(cols, y + radius + 1)):
+                pm[i, j] *= factor
+
+    @njit(cache=True, fastmath=True)
+    def best_candidate(pm, shots, xs, ys):
+        """Index of the highest-weight unshot candidate (first on ties), or -1 if all are shot"""
+        best = -1
+        best_score = -1.0
+        for k in range(xs.shape[0]):
+            if not shots[xs[k], ys[k]] and pm[xs[k], ys[k]] > best_score:
+                best = k
+                best_score = pm[xs[k], ys[k]]
+        return best
+
+    @njit(cache=True)
+    def accumulate_damage(probs, current):
+        """Damage percentages for probs, and current plus those percentages capped at 100"""
+        percentages = np.empty_like(current)
+        updated = np.empty_like(current)
+        for i in range(current.shape[0]):
+            percentages[i] = probs[i] * np.float32(100)
+            updated[i] = min(current[i] + percentages[i], np.float32(100))
+        return percentages, updated
+
+else:
+    def zero_shot_cells(pm, shots):
+        """Set the weight of every shot cell to 0 (in place)"""
+        pm[shots] = 0
+
+    def scale_neighborhood(pm, x, y, radius, factor):
+        """Multiply the cells within radius of (x, y) by factor, clipped to the board (in place)"""
+        rows, cols = pm.shape
+        area = pm[max(0, x - radius):min(rows, x + radius + 1),
+                  max(0, y - radius):min(cols, y + radius + 1)]
+        area *= factor
+
+    def best_candidate(pm, shots, xs, ys):
+        """Index of the highest-weight unshot candidate (first on ties), or -1 if all are shot"""
+        scores = np.where(shots[xs, ys], -1.0, pm[xs, ys])
+        best = int(scores.argmax())
+        return best if scores[best] >= 0 else -1
+
+    def accumulate_damage(probs, current):
+        """Damage percentages for probs, and current plus those percentages capped at 100"""
+        percentages = probs * 100
+        return percentages, np.minimum(current + percentages, 100.0)
@@ -4,9 +4,14 @@ Object-Oriented Programming structure for ships, board, and quantum states
 """
 
 from enum import Enum
-from typing import List, Tuple, Optional
+from functools import lru_cache
+from typing import Dict, List, Set, Tuple, Optional
+import itertools
 import numpy as np
 
+# Process-wide source of game state versions (see Game.bump_version)
+_state_versions = itertools.count()
+
 
 class ShipType(Enum):
     """Enum for different ship types"""
@@ -36,46 +41,76 @@ class CellState(Enum):
     QUANTUM_SUPERPOSITION = "quantum"  # Cell in superposition
 
 
+# Small-int cell codes used when rendering grids, and their wire strings
+CELL_EMPTY, CELL_SHIP, CELL_HIT, CELL_MISS, CELL_QUANTUM = range(5)
+_CODE_TO_STR = (
+    CellState.EMPTY.value,
+    CellState.SHIP.value,
+    CellState.HIT.value,
+    CellState.MISS.value,
+    CellState.QUANTUM_SUPERPOSITION.value
+)
+
+
+def mask_to_grid(mask: int, size: int) -> np.ndarray:
+    """Unpack a board bitmask (cell (x, y) = bit x * size + y) into a size x size bool array"""
+    num_cells = size * size
+    raw = np.frombuffer(mask.to_bytes((num_cells + 7) // 8, 'little'), dtype=np.uint8)
+    return np.unpackbits(raw, bitorder='little')[:num_cells].reshape(size, size).view(bool)
+
+
 class Ship:
     """Represents a battleship"""
 
+    __slots__ = (
+        'ship_type', 'start_pos', 'orientation', 'length', 'hits_mask', 'is_quantum', 'mask',
+        '_full_mask', '_coords', '_coord_to_index'
+    )
+
     def __init__(self, ship_type: ShipType, start_pos: Tuple[int, int], orientation: Orientation):
         self.ship_type = ship_type
         self.start_pos = start_pos
         self.orientation = orientation
         self.length = ship_type.length
-        self.hits = [False] * self.length
+        self.hits_mask = 0  # Bit i set once segment i has been hit
+        self._full_mask = (1 << self.length) - 1
         self.is_quantum = False  # Whether ship is in quantum superposition
+        self.mask = 0  # Board bitmask of occupied cells, set when placed
+
+        # start_pos/orientation never change, so the occupied cells are fixed
+        x, y = start_pos
+        if orientation == Orientation.HORIZONTAL:
+            self._coords = tuple((x, y + i) for i in range(self.length))
+        else:  # VERTICAL
+            self._coords = tuple((x + i, y) for i in range(self.length))
+
+        # Position -> index into hits
+        self._coord_to_index = {coord: i for i, coord in enumerate(self._coords)}
 
     @property
     def name(self) -> str:
         return self.ship_type.ship_name
 
-    def get_coordinates(self) -> List[Tuple[int, int]]:
-        """Get all coordinates occupied by this ship"""
-        coords = []
-        x, y = self.start_pos
-
-        for i in range(self.length):
-            if self.orientation == Orientation.HORIZONTAL:
-                coords.append((x, y + i))
-            else:  # VERTICAL
-                coords.append((x + i, y))
+    @property
+    def hits(self) -> List[bool]:
+        """Hit flag per segment, in coordinate order"""
+        return [bool(self.hits_mask >> i & 1) for i in range(self.length)]
 
-        return coords
+    def get_coordinates(self) -> Tuple[Tuple[int, int], ...]:
+        """Get all coordinates occupied by this ship (computed once at construction)"""
+        return self._coords
 
     def hit(self, position: Tuple[int, int]) -> bool:
         """Register a hit at the given position. Returns True if successful."""
-        coords = self.get_coordinates()
-        if position in coords:
-            index = coords.index(position)
-            self.hits[index] = True
+        index = self._coord_to_index.get(position)
+        if index is not None:
+            self.hits_mask |= 1 << index
             return True
         return False
 
     def is_sunk(self) -> bool:
         """Check if the ship is completely sunk"""
-        return all(self.hits)
+        return self.hits_mask == self._full_mask
 
     def to_dict(self) -> dict:
         """Convert ship to dictionary for JSON serialization"""
@@ -91,42 +126,102 @@ class Ship:
         }
 
 
+@lru_cache(maxsize=None)
+def placement_masks(size: int) -> Dict[Tuple[int, int, int, Orientation], int]:
+    """
+    Bitmask of every in-bounds ship placement on a square board.
+
+    Cell (x, y) is bit x * size + y. Built once per board size.
+
+    Args:
+        size: Board width/height
+
+    Returns:
+        Dict mapping (length, x, y, orientation) to the placement's mask;
+        out-of-bounds placements are absent
+    """
+    masks = {}
+    for length in {ship_type.length for ship_type in ShipType}:
+        for x in range(size):
+            for y in range(size):
+                if y + length <= size:
+                    masks[(length, x, y, Orientation.HORIZONTAL)] = sum(
+                        1 << (x * size + y + i) for i in range(length)
+                    )
+                if x + length <= size:
+                    masks[(length, x, y, Orientation.VERTICAL)] = sum(
+                        1 << ((x + i) * size + y) for i in range(length)
+                    )
+    return masks
+
+
 class GameBoard:
-    """Represents a game board (10x10 grid)"""
+    """
+    Represents a game board (10x10 grid).
+
+    Cell states are kept as bitboards (Python ints, cell (x, y) = bit
+    x * size + y) rather than a grid of CellState objects.
+    """
 
     def __init__(self, size: int = 10):
         self.size = size
-        self.grid = [[CellState.EMPTY for _ in range(size)] for _ in range(size)]
+        self.ship_mask = 0  # Cells occupied by a ship
+        self.hit_mask = 0  # Shots that hit a ship
+        self.miss_mask = 0  # Shots that missed
+        self.quantum_mask = 0  # Cells in superposition
         self.ships: List[Ship] = []
-        self.shots_taken: List[Tuple[int, int]] = []
-        self.quantum_positions: List[Tuple[int, int]] = []  # Cells in superposition
+        self._unsunk_count = 0  # Placed ships not yet sunk
+        self._cell_to_ship: Dict[Tuple[int, int], Ship] = {}  # Occupied cell -> ship
+        self.shots_taken: Set[Tuple[int, int]] = set()
+        self.shots_grid = np.zeros((size, size), dtype=bool)  # Shot cells, for numpy consumers
+
+        # Rendered grids per hide_ships flag, valid while the masks match _grid_key
+        self._grid_cache: Dict[bool, List[List[str]]] = {}
+        self._grid_key: Optional[Tuple[int, int, int, int]] = None
+
+    def clear(self):
+        """Return the board to its empty initial state, reusing its containers"""
+        self.ship_mask = 0
+        self.hit_mask = 0
+        self.miss_mask = 0
+        self.quantum_mask = 0
+        self.ships.clear()
+        self._unsunk_count = 0
+        self._cell_to_ship.clear()
+        self.shots_taken.clear()
+        self.shots_grid.fill(False)
+        self._grid_cache.clear()
+        self._grid_key = None
 
-    def is_valid_position(self, ship: Ship) -> bool:
-        """Check if a ship can be placed at the given position"""
-        coords = ship.get_coordinates()
+    @property
+    def shots_mask(self) -> int:
+        """Every cell that has been shot at"""
+        return self.hit_mask | self.miss_mask
 
-        # Check if all coordinates are within bounds
-        for x, y in coords:
-            if x < 0 or x >= self.size or y < 0 or y >= self.size:
-                return False
+    def _placement_mask(self, ship: Ship) -> int:
+        """Bitmask for the ship's cells, or 0 if it leaves the board"""
+        x, y = ship.start_pos
+        return placement_masks(self.size).get((ship.length, x, y, ship.orientation), 0)
 
-        # Check if any coordinate overlaps with existing ships
-        for x, y in coords:
-            if self.grid[x][y] == CellState.SHIP:
-                return False
+    def is_valid_position(self, ship: Ship) -> bool:
+        """Check if a ship can be placed at the given position"""
+        mask = self._placement_mask(ship)
 
-        return True
+        # In bounds and not overlapping existing ships
+        return mask != 0 and not (mask & self.ship_mask)
 
     def place_ship(self, ship: Ship) -> bool:
         """Place a ship on the board. Returns True if successful."""
-        if not self.is_valid_position(ship):
+        mask = self._placement_mask(ship)
+        if mask == 0 or mask & self.ship_mask:
             return False
 
-        coords = ship.get_coordinates()
-        for x, y in coords:
-            self.grid[x][y] = CellState.SHIP
-
+        ship.mask = mask
+        self.ship_mask |= mask
         self.ships.append(ship)
+        self._unsunk_count += 1
+        for coord in ship.get_coordinates():
+            self._cell_to_ship[coord] = ship
         return True
 
     def receive_shot(self, position: Tuple[int, int]) -> dict:
@@ -142,18 +237,21 @@ class GameBoard:
                 "message": "This position was already targeted"
             }
 
-        self.shots_taken.append((x, y))
+        self.shots_taken.add((x, y))
+        self.shots_grid[x, y] = True
+        bit = 1 << (x * self.size + y)
 
         # Check if any ship was hit
-        hit_ship = None
-        for ship in self.ships:
-            if ship.hit((x, y)):
-                hit_ship = ship
-                self.grid[x][y] = CellState.HIT
-                break
+        hit_ship = self._cell_to_ship.get((x, y))
+        if hit_ship:
+            self.hit_mask |= bit
+            hit_ship.hit((x, y))
 
         if hit_ship:
-            is_sunk = hit_ship.is_sunk()
+            is_sunk = (hit_ship.mask & self.hit_mask) == hit_ship.mask
+            if is_sunk:
+                # Each cell is hit at most once, so this runs once per ship
+                self._unsunk_count -= 1
             return {
                 "result": "hit",
                 "ship_name": hit_ship.name,
@@ -161,7 +259,7 @@ class GameBoard:
                 "message": f"Hit! {hit_ship.name} {'sunk!' if is_sunk else 'damaged!'}"
             }
         else:
-            self.grid[x][y] = CellState.MISS
+            self.miss_mask |= bit
             return {
                 "result": "miss",
                 "message": "Miss!"
@@ -169,30 +267,44 @@ class GameBoard:
 
     def all_ships_sunk(self) -> bool:
         """Check if all ships are sunk"""
-        return all(ship.is_sunk() for ship in self.ships)
+        return self._unsunk_count == 0
 
     def get_visible_grid(self, hide_ships: bool = True) -> List[List[str]]:
         """
         Get the grid state for display.
         If hide_ships is True, unshot ship positions appear as empty.
-        """
-        visible_grid = []
-
-        for i in range(self.size):
-            row = []
-            for j in range(self.size):
-                cell = self.grid[i][j]
-
-                if hide_ships and cell == CellState.SHIP:
-                    row.append(CellState.EMPTY.value)
-                elif (i, j) in self.quantum_positions:
-                    row.append(CellState.QUANTUM_SUPERPOSITION.value)
-                else:
-                    row.append(cell.value)
-
-            visible_grid.append(row)
 
-        return visible_grid
+        The result is cached until a ship is placed or a cell changes state;
+        treat it as read-only.
+        """
+        key = (self.ship_mask, self.hit_mask, self.miss_mask, self.quantum_mask)
+        if key != self._grid_key:
+            self._grid_cache.clear()
+            self._grid_key = key
+
+        grid = self._grid_cache.get(hide_ships)
+        if grid is None:
+            grid = self._grid_cache[hide_ships] = self._render_grid(hide_ships)
+        return grid
+
+    def _render_grid(self, hide_ships: bool) -> List[List[str]]:
+        """Build the visible grid from the bitboards"""
+        codes = np.zeros((self.size, self.size), dtype=np.int8)
+        ships = mask_to_grid(self.ship_mask, self.size)
+
+        if not hide_ships:
+            codes[ships] = CELL_SHIP
+        codes[mask_to_grid(self.hit_mask, self.size)] = CELL_HIT
+        codes[mask_to_grid(self.miss_mask, self.size)] = CELL_MISS
+
+        if self.quantum_mask:
+            # Superposition shows through, except on hidden unshot ships
+            quantum = mask_to_grid(self.quantum_mask, self.size)
+            if hide_ships:
+                quantum &= ~(ships & (codes == CELL_EMPTY))
+            codes[quantum] = CELL_QUANTUM
+
+        return [[_CODE_TO_STR[code] for code in row] for row in codes.tolist()]
 
     def to_dict(self, hide_ships: bool = True) -> dict:
         """Convert board to dictionary for JSON serialization"""
@@ -201,13 +313,18 @@ class GameBoard:
             "grid": self.get_visible_grid(hide_ships),
             "ships": [ship.to_dict() for ship in self.ships] if not hide_ships else [],
             "shots_taken": len(self.shots_taken),
-            "ships_remaining": sum(1 for ship in self.ships if not ship.is_sunk())
+            "ships_remaining": self._unsunk_count
         }
 
 
 class Game:
     """Represents a complete game instance"""
 
+    __slots__ = (
+        'game_id', 'player_name', 'player_board', 'ai_board', 'current_turn',
+        'game_over', 'winner', 'quantum_mode', 'state_version'
+    )
+
     def __init__(self, game_id: str, player_name: str = "Player"):
         self.game_id = game_id
         self.player_name = player_name
@@ -217,6 +334,11 @@ class Game:
         self.game_over = False
         self.winner = None
         self.quantum_mode = True  # Whether quantum mechanics are enabled
+        self.state_version = next(_state_versions)
+
+    def bump_version(self):
+        """Mark the game state as changed (invalidates cached responses)"""
+        self.state_version = next(_state_versions)
 
     def switch_turn(self):
         """Switch between player and AI turns"""
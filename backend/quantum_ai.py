@@ -3,24 +3,77 @@ Quantum AI for Battleship
 Uses Qiskit quantum circuits to make intelligent targeting decisions
 """
 
+from functools import lru_cache
 from typing import List, Tuple, Optional
 import numpy as np
-from qiskit import QuantumCircuit, QuantumRegister, ClassicalRegister
+from qiskit import QuantumCircuit, QuantumRegister, ClassicalRegister, transpile
 from qiskit_aer import AerSimulator
 from models import GameBoard, CellState
+from kernels import zero_shot_cells, scale_neighborhood, best_candidate
 import random
 
 
+@lru_cache(maxsize=None)
+def _superposition_circuit(num_qubits: int) -> QuantumCircuit:
+    """Target-selection circuit for a register size, built and transpiled for Aer once"""
+    # Create quantum circuit
+    qreg = QuantumRegister(num_qubits, 'q')
+    creg = ClassicalRegister(num_qubits, 'c')
+    qc = QuantumCircuit(qreg, creg)
+
+    # Create superposition of all states
+    for i in range(num_qubits):
+        qc.h(qreg[i])
+
+    # Add phase based on probability map (simplified version)
+    # In a real implementation, this would use amplitude amplification
+    for i in range(num_qubits):
+        qc.rz(np.pi / 4, qreg[i])
+
+    # Measure
+    qc.measure(qreg, creg)
+
+    return transpile(qc, AerSimulator(), optimization_level=1)
+
+
+@lru_cache(maxsize=1)
+def _random_bits_circuit() -> QuantumCircuit:
+    """4-qubit placement randomness circuit, built and transpiled for Aer once"""
+    # Create quantum circuit for randomness
+    qc = QuantumCircuit(4, 4)
+
+    # Create superposition
+    for i in range(4):
+        qc.h(i)
+
+    # Add some entanglement for better randomness
+    qc.cx(0, 1)
+    qc.cx(2, 3)
+
+    # Measure
+    qc.measure(range(4), range(4))
+
+    return transpile(qc, AerSimulator(), optimization_level=1)
+
+
 class QuantumAI:
     """
     AI opponent that uses quantum computing concepts for decision making.
     Uses quantum superposition and measurement for targeting strategy.
     """
 
-    def __init__(self, board_size: int = 10):
+    def __init__(self, board_size: int = 10, use_real_quantum: bool = False):
+        """
+        Args:
+            board_size: Width/height of the board
+            use_real_quantum: Run target selection on the Aer simulator instead
+                of sampling the (identical) uniform distribution with numpy
+        """
         self.board_size = board_size
-        self.simulator = AerSimulator()
-        self.probability_map = np.ones((board_size, board_size)) / (board_size * board_size)
+        self.use_real_quantum = use_real_quantum
+        self.simulator = AerSimulator() if use_real_quantum else None
+        self.rng = np.random.default_rng()
+        self.probability_map = np.full((board_size, board_size), 1 / (board_size * board_size), dtype=np.float32)
         self.last_hit = None
         self.hunt_mode = False
         self.target_queue: List[Tuple[int, int]] = []
@@ -29,16 +82,19 @@ class QuantumAI:
         """
         Update probability map based on current board state.
         Cells already shot have 0 probability.
+
+        The map is kept as unnormalized weights: targeting only compares
+        cells, which is scale-invariant. Use normalized_map for probabilities.
         """
-        for i in range(self.board_size):
-            for j in range(self.board_size):
-                if (i, j) in board.shots_taken:
-                    self.probability_map[i][j] = 0
+        zero_shot_cells(self.probability_map, board.shots_grid)
 
-        # Normalize probabilities
-        total = np.sum(self.probability_map)
+    @property
+    def normalized_map(self) -> np.ndarray:
+        """Probability map scaled to sum to 1 (computed on demand)"""
+        total = self.probability_map.sum()
         if total > 0:
-            self.probability_map = self.probability_map / total
+            return self.probability_map / total
+        return self.probability_map.copy()
 
     def quantum_target_selection(self, num_targets: int = 1) -> List[Tuple[int, int]]:
         """
@@ -49,32 +105,15 @@ class QuantumAI:
         num_positions = self.board_size * self.board_size
         num_qubits = int(np.ceil(np.log2(num_positions)))
 
-        # Create quantum circuit
-        qreg = QuantumRegister(num_qubits, 'q')
-        creg = ClassicalRegister(num_qubits, 'c')
-        qc = QuantumCircuit(qreg, creg)
-
-        # Create superposition of all states
-        for i in range(num_qubits):
-            qc.h(qreg[i])
-
-        # Add phase based on probability map (simplified version)
-        # In a real implementation, this would use amplitude amplification
-        for i in range(num_qubits):
-            qc.rz(np.pi / 4, qreg[i])
-
-        # Measure
-        qc.measure(qreg, creg)
-
-        # Execute circuit
-        job = self.simulator.run(qc, shots=num_targets * 10)
-        result = job.result()
-        counts = result.get_counts()
+        if self.use_real_quantum:
+            measured = self._measure_superposition(num_qubits, num_targets * 10)
+        else:
+            measured = self._sample_superposition(num_qubits, num_targets * 10)
 
-        # Convert measured binary states to board positions
+        # Convert measured states to board positions
         targets = []
-        for bitstring in list(counts.keys())[:num_targets * 2]:
-            position_index = int(bitstring, 2) % num_positions
+        for state in measured[:num_targets * 2]:
+            position_index = state % num_positions
             x = position_index // self.board_size
             y = position_index % self.board_size
 
@@ -83,6 +122,34 @@ class QuantumAI:
 
         return targets[:num_targets]
 
+    def _sample_superposition(self, num_qubits: int, shots: int) -> List[int]:
+        """
+        Sample measurement outcomes of the uniform superposition directly.
+
+        Measuring H|0>^n gives every basis state with probability 1/2^n (the
+        RZ phases do not change that), so this matches the circuit's output
+        distribution without building or simulating it.
+
+        Returns:
+            Distinct measured states in first-seen order
+        """
+        samples = self.rng.integers(0, 1 << num_qubits, size=shots)
+        return list(dict.fromkeys(samples.tolist()))
+
+    def _measure_superposition(self, num_qubits: int, shots: int) -> List[int]:
+        """
+        Measure the uniform superposition on the Aer simulator.
+
+        Returns:
+            Distinct measured states in the order Aer reports them
+        """
+        # Execute circuit
+        job = self.simulator.run(_superposition_circuit(num_qubits), shots=shots)
+        result = job.result()
+        counts = result.get_counts()
+
+        return [int(bitstring, 2) for bitstring in counts]
+
     def get_adjacent_cells(self, position: Tuple[int, int]) -> List[Tuple[int, int]]:
         """Get valid adjacent cells (up, down, left, right)"""
         x, y = position
@@ -130,23 +197,20 @@ class QuantumAI:
         # Use quantum circuit to generate candidate positions
         quantum_targets = self.quantum_target_selection(num_targets=5)
 
-        # Filter out already shot positions
-        valid_targets = [t for t in quantum_targets if t not in board.shots_taken]
-
-        if valid_targets:
-            # Weight by probability map
-            best_target = max(valid_targets,
-                              key=lambda t: self.probability_map[t[0]][t[1]])
-            return best_target
+        if quantum_targets:
+            # Weight by probability map, ruling out already shot positions
+            xs, ys = np.array(quantum_targets).T
+            best = best_candidate(self.probability_map, board.shots_grid, xs, ys)
+            if best >= 0:
+                return quantum_targets[best]
 
         # Fallback: random unshot position
-        available = []
-        for i in range(self.board_size):
-            for j in range(self.board_size):
-                if (i, j) not in board.shots_taken:
-                    available.append((i, j))
+        available = np.flatnonzero(~board.shots_grid)
+        if available.size == 0:
+            return (0, 0)
 
-        return random.choice(available) if available else (0, 0)
+        x, y = divmod(int(available[self.rng.integers(available.size)]), self.board_size)
+        return (x, y)
 
     def make_move(self, board: GameBoard) -> Tuple[int, int]:
         """
@@ -174,11 +238,7 @@ class QuantumAI:
             self.hunt_mode = True
 
             # Increase probability around hit
-            for dx in range(-2, 3):
-                for dy in range(-2, 3):
-                    x, y = position[0] + dx, position[1] + dy
-                    if 0 <= x < self.board_size and 0 <= y < self.board_size:
-                        self.probability_map[x][y] *= 2.0
+            scale_neighborhood(self.probability_map, position[0], position[1], 2, 2.0)
 
             # Add adjacent cells to target queue if ship not sunk
             if not result.get("is_sunk", False):
@@ -189,11 +249,7 @@ class QuantumAI:
 
         elif result["result"] == "miss":
             # Decrease probability around miss
-            for dx in range(-1, 2):
-                for dy in range(-1, 2):
-                    x, y = position[0] + dx, position[1] + dy
-                    if 0 <= x < self.board_size and 0 <= y < self.board_size:
-                        self.probability_map[x][y] *= 0.8
+            scale_neighborhood(self.probability_map, position[0], position[1], 1, 0.8)
 
         # If ship was sunk, clear targeting mode
         if result.get("is_sunk", False):
@@ -207,44 +263,48 @@ class QuantumShipPlacer:
     Uses quantum circuits to generate random but strategic ship placements.
     """
 
-    def __init__(self, board_size: int = 10):
+    def __init__(self, board_size: int = 10, use_real_quantum: bool = False):
+        """
+        Args:
+            board_size: Width/height of the board
+            use_real_quantum: Measure the 4-qubit circuit on the Aer simulator
+                instead of drawing the (identically distributed) bits directly
+        """
         self.board_size = board_size
-        self.simulator = AerSimulator()
+        self.use_real_quantum = use_real_quantum
+        self.simulator = AerSimulator() if use_real_quantum else None
 
     def quantum_random_placement(self, ship_length: int) -> Tuple[Tuple[int, int], str]:
         """
         Use quantum randomness to determine ship placement.
         Returns (start_position, orientation).
         """
-        # Create quantum circuit for randomness
-        qc = QuantumCircuit(4, 4)
+        if self.use_real_quantum:
+            bits = self._measure_random_bits()
+        else:
+            # H on every qubit makes all 16 outcomes equally likely and the
+            # CX gates only permute them, so 4 uniform bits are equivalent
+            bits = random.getrandbits(4)
 
-        # Create superposition
-        for i in range(4):
-            qc.h(i)
+        # Extract values from measurement (bit 3 is the leftmost character)
+        x = ((bits >> 2) & 3) % self.board_size
+        y = (bits & 3) % self.board_size
+        orientation = "horizontal" if (bits >> 3) & 1 == 0 else "vertical"
 
-        # Add some entanglement for better randomness
-        qc.cx(0, 1)
-        qc.cx(2, 3)
+        # Ensure ship fits on board
+        if orientation == "horizontal" and y + ship_length > self.board_size:
+            y = self.board_size - ship_length
+        elif orientation == "vertical" and x + ship_length > self.board_size:
+            x = self.board_size - ship_length
 
-        # Measure
-        qc.measure(range(4), range(4))
+        return ((x, y), orientation)
 
+    def _measure_random_bits(self) -> int:
+        """Measure the 4-qubit randomness circuit once and return the outcome"""
         # Execute
-        job = self.simulator.run(qc, shots=1)
+        job = self.simulator.run(_random_bits_circuit(), shots=1)
         result = job.result()
         counts = result.get_counts()
         measurement = list(counts.keys())[0]
 
-        # Extract values from measurement
-        x = int(measurement[0:2], 2) % self.board_size
-        y = int(measurement[2:4], 2) % self.board_size
-        orientation = "horizontal" if int(measurement[0], 2) == 0 else "vertical"
-
-        # Ensure ship fits on board
-        if orientation == "horizontal" and y + ship_length > self.board_size:
-            y = self.board_size - ship_length
-        elif orientation == "vertical" and x + ship_length > self.board_size:
-            x = self.board_size - ship_length
-
-        return ((x, y), orientation)
\ No newline at end of file
+        return int(measurement, 2)
@@ -7,11 +7,191 @@ using quantum superposition and interference patterns.
 """
 
 from qiskit import QuantumCircuit, QuantumRegister, ClassicalRegister, transpile
+from qiskit.circuit import ParameterVector
 from qiskit_aer import AerSimulator
 import numpy as np
-from typing import List, Dict, Tuple
+from typing import Callable, Iterable, List, Dict, Optional, Tuple, Union
+from functools import lru_cache
+from kernels import accumulate_damage
+from array import array
+import io
+import itertools
 import json
 
+# Process-wide source of state versions; unique across games, so a reset game
+# never reuses a version (and therefore a cached response) of its predecessor
+_state_versions = itertools.count()
+
+# RY angle applied to a qubit for every bomb that hits a ship there
+ROTATION_ANGLE = np.pi / 8
+
+# Measurement shots per circuit (simulated or synthesized)
+SHOTS = 1024
+
+# Aer configuration for the simulated path. A 5-qubit statevector has no use
+# for double precision, and is far below the size where OpenMP threads or
+# gate fusion pay for their own setup, so both are off.
+SIMULATOR_OPTIONS = {
+    'method': 'statevector',
+    'precision': 'single',
+    'max_parallel_threads': 1,
+    'max_parallel_shots': 1,
+    'max_parallel_experiments': 1,
+    'fusion_enable': False
+}
+
+
+@lru_cache(maxsize=1)
+def _shared_simulator() -> AerSimulator:
+    """
+    The AerSimulator every simulating game runs on, created on first use.
+
+    run() only reads the backend's options, so concurrent games can share it.
+    """
+    return AerSimulator(**SIMULATOR_OPTIONS)
+
+
+@lru_cache(maxsize=None)
+def _outcome_bits(num_qubits: int) -> np.ndarray:
+    """(2**num_qubits, num_qubits) matrix of each outcome's bits; row k is outcome k, column i is qubit i"""
+    outcomes = np.arange(1 << num_qubits)
+    return (outcomes[:, None] >> np.arange(num_qubits)) & 1
+
+
+@lru_cache(maxsize=256)
+def _analytic_distribution(hit_counts: Tuple[int, ...]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Exact measurement distribution of the bomb circuit for the given hits per qubit.
+
+    Every qubit is an independent RY(angle)|0⟩, so it reads |1⟩ with
+    probability sin²(angle / 2) and each bitstring's probability is the
+    product over its qubits. The circuit depends on nothing but the hit
+    counts, so results are shared by every game and player; the returned
+    arrays are read-only.
+
+    Args:
+        hit_counts: Number of bombs that hit a ship, per qubit
+
+    Returns:
+        (probability of |1⟩ per qubit, probability of each outcome indexed by
+        the bitstring's integer value)
+    """
+    # Total rotation per qubit (consecutive RY gates add their angles)
+    angles = np.array(hit_counts) * ROTATION_ANGLE
+    p_one = np.sin(angles / 2) ** 2
+
+    outcome_probs = np.where(_outcome_bits(len(hit_counts)), p_one, 1 - p_one).prod(axis=1)
+    outcome_probs /= outcome_probs.sum()
+
+    p_one.flags.writeable = False
+    outcome_probs.flags.writeable = False
+    return p_one, outcome_probs
+
+
+@lru_cache(maxsize=None)
+def _bomb_circuit_template(num_qubits: int) -> QuantumCircuit:
+    """
+    Bomb-tester circuit with one RY angle parameter per qubit, transpiled for Aer once.
+
+    Binding the per-qubit totals gives the same circuit as applying one
+    RY(ROTATION_ANGLE) per hit, without re-transpiling on every bomb. The
+    exact outcome probabilities are saved alongside the shot counts.
+    """
+    thetas = ParameterVector('theta', num_qubits)
+    qreg = QuantumRegister(num_qubits, 'q')
+    creg = ClassicalRegister(num_qubits, 'c')
+    qc = QuantumCircuit(qreg, creg)
+
+    for i in range(num_qubits):
+        qc.ry(thetas[i], qreg[i])
+    qc.save_probabilities()
+    qc.measure(qreg, creg)
+
+    return transpile(qc, _shared_simulator())
+
+
+@lru_cache(maxsize=32)
+def get_circuit_drawing(hit_counts: Tuple[int, ...]) -> str:
+    """
+    Text drawing of the bomb circuit, for display.
+
+    Drawing is slow in Qiskit, so bombs only return a short summary and
+    the diagram is rendered here on request (and memoized).
+
+    Args:
+        hit_counts: Number of bombs that hit a ship, per qubit
+
+    Returns:
+        Circuit diagram as a string (for JSON serialization)
+    """
+    num_qubits = len(hit_counts)
+
+    # Create 5-qubit circuit (one per grid position)
+    qreg = QuantumRegister(num_qubits, 'q')
+    creg = ClassicalRegister(num_qubits, 'c')
+    qc = QuantumCircuit(qreg, creg)
+
+    # For each bomb that hit a ship, apply RY rotation
+    # This models the quantum interference pattern changing when a "bomb" (photon)
+    # encounters a ship (obstruction)
+    for position, hits in enumerate(hit_counts):
+        for _ in range(hits):
+            # The angle determines sensitivity (small angle = subtle detection)
+            qc.ry(ROTATION_ANGLE, qreg[position])
+
+    # Measure all qubits
+    for i in range(num_qubits):
+        qc.measure(qreg[i], creg[i])
+
+    return str(qc.draw('text'))
+
+
+# Ship status cells, indexed by how many damage thresholds (> 0, >= 50, >= 95) are reached
+_STATUS_CELLS = np.array([" SAFE ", " DMGD ", " CRIT ", " DEST "])
+
+
+@lru_cache(maxsize=4096)
+def _render_damage_map(player: int, damage: Tuple[float, ...], ships: Tuple[int, ...]) -> str:
+    """
+    Render the ASCII damage map for one player.
+
+    Memoized on the damage/ship values, so repeated visualize requests for an
+    unchanged game reuse the same string; any bomb changes the key.
+
+    Args:
+        player: 1 or 2 (used in the header)
+        damage: Damage per grid position (0-100%)
+        ships: Positions holding that player's ships
+
+    Returns:
+        String with visualization
+    """
+    buf = io.StringIO()
+    buf.write(f"\n=== Player {player} Damage Map ===\n")
+
+    buf.write("Position: ")
+    for i in range(len(damage)):
+        buf.write(f"  {i}  ")
+    buf.write("\n")
+
+    buf.write("Damage:   ")
+    for i, dmg in enumerate(damage):
+        ship_marker = "S" if i in ships else " "
+        buf.write(f"{dmg:4.1f}%{ship_marker}")
+    buf.write("\n")
+
+    # Status for every cell at once: threshold count -> label, "----" off ships
+    values = np.asarray(damage)
+    levels = (values > 0).astype(np.intp) + (values >= 50.0) + (values >= 95.0)
+    on_ship = np.zeros(len(damage), dtype=bool)
+    on_ship[list(ships)] = True
+
+    buf.write("Status:   ")
+    buf.write("".join(np.where(on_ship, _STATUS_CELLS[levels], " ---- ").tolist()))
+    buf.write("\n")
+
+    return buf.getvalue()
+
 
 class QuantumBattleshipGame:
     """
@@ -26,31 +206,89 @@ class QuantumBattleshipGame:
     - Game ends when all 3 ships of a player reach >95% damage
     """
 
-    def __init__(self, game_id: str):
+    # Fixed by the hackathon spec, so shared by every game rather than stored per instance
+    grid_size = 5  # 5-cell grid
+    ships_per_player = 3
+
+    # Every per-game attribute; no instance __dict__
+    __slots__ = (
+        'game_id',
+        'player1_ships', 'player2_ships', 'player1_ships_mask', 'player2_ships_mask',
+        'player1_ships_np', 'player2_ships_np',
+        'player1_damage', 'player2_damage',
+        'player1_bombs', 'player2_bombs', 'player1_hits', 'player2_hits',
+        'simulator', 'circuit_runner', 'simulate', 'rng', '_circuit_cache',
+        'current_round', 'game_over', 'winner', 'state_version'
+    )
+
+    def __init__(
+            self,
+            game_id: str,
+            circuit_runner: Optional[
+                Callable[[List[Tuple[float, ...]]], List[Tuple[Dict[str, int], np.ndarray]]]
+            ] = None,
+            simulate: bool = False
+    ):
+        """
+        Args:
+            game_id: Unique game identifier
+            circuit_runner: Optional callable that executes the circuit elsewhere
+                (e.g. circuit_pool.run_rotations). It receives the total RY angle
+                per qubit for each circuit needed and returns one (measurement
+                counts, probability of |1⟩ per qubit) pair per circuit.
+                Defaults to running on the shared AerSimulator.
+                Only used when simulating.
+            simulate: Run the circuit on the Aer simulator instead of computing
+                its measurement statistics analytically
+        """
         self.game_id = game_id
-        self.grid_size = 5  # 5-cell grid as per hackathon spec
-        self.ships_per_player = 3
 
         # Ship positions for both players
         self.player1_ships = []  # List of 3 positions (0-4)
         self.player2_ships = []  # List of 3 positions (0-4)
 
+        # Same positions as bitmasks (bit p set = ship at position p)
+        self.player1_ships_mask = 0
+        self.player2_ships_mask = 0
+
+        # And as index arrays, for gathering ship damage
+        self.player1_ships_np = np.empty(0, dtype=np.intp)
+        self.player2_ships_np = np.empty(0, dtype=np.intp)
+
         # Track damage to each ship position (0-100%)
-        self.player1_damage = [0.0] * self.grid_size
-        self.player2_damage = [0.0] * self.grid_size
+        self.player1_damage = np.zeros(self.grid_size, dtype=np.float32)
+        self.player2_damage = np.zeros(self.grid_size, dtype=np.float32)
+
+        # Bomb history (positions 0-4, one byte each; listed when serialized)
+        self.player1_bombs = array('B')
+        self.player2_bombs = array('B')
 
-        # Bomb history
-        self.player1_bombs = []  # History of bomb positions
-        self.player2_bombs = []  # History of bomb positions
+        # Bombs that hit an opponent ship, per position (the circuit's input),
+        # kept up to date on every bomb instead of recounted from the history
+        self.player1_hits = [0] * self.grid_size
+        self.player2_hits = [0] * self.grid_size
 
-        # Quantum simulator
-        self.simulator = AerSimulator()
+        # Quantum simulator (shared by all games; none needed for exact results)
+        self.simulator = _shared_simulator() if simulate else None
+        self.circuit_runner = circuit_runner
+        self.simulate = simulate
+        self.rng = np.random.default_rng()  # Synthesizes counts when not simulating
+
+        # Circuit results by hit count per qubit; the circuit depends on nothing else
+        self._circuit_cache: Dict[Tuple[int, ...], Dict] = {}
 
         # Game state
         self.current_round = 0
         self.game_over = False
         self.winner = None
 
+        # Changes on every mutation; used as a cache key for serialized state
+        self.state_version = next(_state_versions)
+
+    def bump_version(self):
+        """Mark the game state as changed (invalidates cached responses)"""
+        self.state_version = next(_state_versions)
+
     def setShipPosition(self, player: int, positions: List[int]) -> bool:
         """
         Set ship positions for a player.
@@ -71,13 +309,30 @@ class QuantumBattleshipGame:
         if any(p < 0 or p >= self.grid_size for p in positions):
             return False  # Positions must be 0-4
 
+        if any(p != int(p) for p in positions):
+            return False  # Positions must be whole numbers
+
+        positions = [int(p) for p in positions]
+
+        mask = 0
+        for p in positions:
+            mask |= 1 << p
+
+        # Moving ships changes which past bombs count as hits
         if player == 1:
             self.player1_ships = sorted(positions)
+            self.player1_ships_mask = mask
+            self.player1_ships_np = np.array(self.player1_ships, dtype=np.intp)
+            self.player2_hits = self._hit_counts(self.player2_bombs, mask)
         elif player == 2:
             self.player2_ships = sorted(positions)
+            self.player2_ships_mask = mask
+            self.player2_ships_np = np.array(self.player2_ships, dtype=np.intp)
+            self.player1_hits = self._hit_counts(self.player1_bombs, mask)
         else:
             return False
 
+        self.bump_version()
         return True
 
     def bombShip(self, player: int, position: int) -> Dict:
@@ -101,17 +356,23 @@ class QuantumBattleshipGame:
         # Record the bomb
         if player == 1:
             self.player1_bombs.append(position)
-            opponent_ships = self.player2_ships
+            hits = self.player1_hits
+            opponent_ships = self.player2_ships_np
+            opponent_mask = self.player2_ships_mask
             opponent_damage = self.player2_damage
         else:
             self.player2_bombs.append(position)
-            opponent_ships = self.player1_ships
+            hits = self.player2_hits
+            opponent_ships = self.player1_ships_np
+            opponent_mask = self.player1_ships_mask
             opponent_damage = self.player1_damage
 
+        hit_ship = bool((opponent_mask >> position) & 1)
+        if hit_ship:
+            hits[position] += 1
+
         # Build and run quantum circuit
-        circuit_results = self._build_quantum_circuit(
-            player, position, opponent_ships
-        )
+        circuit_results = self._build_quantum_circuit(player, position)
 
         # Calculate damage from quantum measurements
         damage_results = self.calculateDamageToShips(
@@ -129,11 +390,13 @@ class QuantumBattleshipGame:
         # Check for game over
         self._check_game_over()
 
+        self.bump_version()
+
         return {
             "success": True,
             "player": player,
             "bomb_position": position,
-            "hit_ship": position in opponent_ships,
+            "hit_ship": hit_ship,
             "quantum_measurements": circuit_results,
             "damage_results": damage_results,
             "game_over": self.game_over,
@@ -141,11 +404,44 @@ class QuantumBattleshipGame:
             "round": self.current_round
         }
 
+    def bombShipBatch(self, player: int, positions: List[int]) -> List[Dict]:
+        """
+        Bomb several positions in order, exactly as repeated bombShip calls would.
+
+        Every circuit the sequence needs is evaluated up front (in a single
+        simulator or circuit-runner run when simulating), then the bombs are
+        applied one at a time.
+
+        Args:
+            player: 1 or 2 (who is bombing)
+            positions: Grid positions to bomb, in order
+
+        Returns:
+            One bombShip result per position
+        """
+        if player == 1:
+            hit_counts = list(self.player1_hits)
+            opponent_mask = self.player2_ships_mask
+        else:
+            hit_counts = list(self.player2_hits)
+            opponent_mask = self.player1_ships_mask
+
+        # Hit counts after each bomb of the sequence
+        keys = []
+        for position in positions:
+            if 0 <= position < self.grid_size and (opponent_mask >> position) & 1:
+                hit_counts[position] += 1
+            keys.append(tuple(hit_counts))
+
+        if not self.game_over:
+            self._run_circuits(keys)
+
+        return [self.bombShip(player, position) for position in positions]
+
     def _build_quantum_circuit(
             self,
             player: int,
-            bomb_position: int,
-            opponent_ships: List[int]
+            bomb_position: int
     ) -> Dict:
         """
         Build and execute the quantum circuit based on Elitzur-Vaidman bomb tester.
@@ -158,110 +454,133 @@ class QuantumBattleshipGame:
         Args:
             player: Which player is bombing
             bomb_position: Position being bombed
-            opponent_ships: List of opponent's ship positions
 
         Returns:
             Dict with circuit results and probabilities
         """
-        # Create 5-qubit circuit (one per grid position)
-        qreg = QuantumRegister(self.grid_size, 'q')
-        creg = ClassicalRegister(self.grid_size, 'c')
-        qc = QuantumCircuit(qreg, creg)
-
-        # Get all historical bombs for this player
-        all_bombs = self.player1_bombs if player == 1 else self.player2_bombs
-
-        # For each bomb that hit a ship, apply RY rotation
-        # This models the quantum interference pattern changing when a "bomb" (photon)
-        # encounters a ship (obstruction)
-        for bomb_pos in all_bombs:
-            if bomb_pos in opponent_ships:
-                # Apply rotation to this qubit
-                # The angle determines sensitivity (small angle = subtle detection)
-                rotation_angle = np.pi / 8  # Can be tuned
-                qc.ry(rotation_angle, qreg[bomb_pos])
-
-        # Measure all qubits
-        for i in range(self.grid_size):
-            qc.measure(qreg[i], creg[i])
-
-        # Transpile and run circuit
-        transpiled_qc = transpile(qc, self.simulator)
-        job = self.simulator.run(transpiled_qc, shots=1024)
-        result = job.result()
-        counts = result.get_counts()
-
-        # Calculate probabilities for each qubit being |1⟩
-        probabilities = self._calculate_qubit_probabilities(counts)
+        # Hits this player has landed so far, per qubit
+        key = tuple(self.player1_hits if player == 1 else self.player2_hits)
+        self._run_circuits([key])
 
-        return {
-            "circuit": str(qc.draw('text')),  # FIXED: Convert to string for JSON serialization
-            "counts": counts,
-            "probabilities": probabilities,
-            "total_shots": 1024
-        }
+        return dict(self._circuit_cache[key])
+
+    def _hit_counts(self, bombs: Iterable[int], ships_mask: int) -> List[int]:
+        """Count the bombs that hit a ship (a set bit of ships_mask), per qubit"""
+        hit_counts = [0] * self.grid_size
+        for bomb_pos in bombs:
+            if (ships_mask >> bomb_pos) & 1:
+                hit_counts[bomb_pos] += 1
+        return hit_counts
 
-    def _calculate_qubit_probabilities(self, counts: Dict[str, int]) -> List[float]:
+    def _run_circuits(self, keys: List[Tuple[int, ...]]):
+        """
+        Evaluate the circuit for every hit-count key not yet in the cache.
+
+        Same hits, same circuit, so cached measurements are reused instead of
+        re-running. When simulating, all missing circuits go to the simulator
+        (or the circuit runner) in one run.
+
+        Args:
+            keys: Hits per qubit for each circuit needed
         """
-        Calculate the probability of each qubit being measured as |1⟩.
-        This represents the "damage" to each ship position.
+        missing = [key for key in dict.fromkeys(keys) if key not in self._circuit_cache]
+        if not missing:
+            return
+
+        # Total rotation per qubit (consecutive RY gates add their angles)
+        all_angles = [np.array(key) * ROTATION_ANGLE for key in missing]
+
+        if not self.simulate:
+            # Unentangled RY-only circuit: exact probabilities, sampled counts
+            measurements = [self._analytic_measurements(key) for key in missing]
+        elif self.circuit_runner is not None:
+            # Executed out of process on the same template, which also returns
+            # the saved (not histogrammed) probability of each qubit being |1⟩.
+            # One call for every missing circuit, so a batch is one round trip
+            runs = self.circuit_runner([tuple(angles.tolist()) for angles in all_angles])
+            measurements = [(probabilities, counts) for counts, probabilities in runs]
+        else:
+            # Run the pre-transpiled template once per set of angles, as one job.
+            # Aer binds the values itself, so no bound copies of the circuit are
+            # built and the shared template is never modified
+            template = _bomb_circuit_template(self.grid_size)
+            values = np.array(all_angles).T.tolist()
+            job = self.simulator.run(
+                template,
+                parameter_binds=[dict(zip(template.parameters, values))],
+                shots=SHOTS
+            )
+            result = job.result()
+
+            # Probability of each qubit being |1⟩, marginalized from the saved
+            # outcome probabilities rather than histogrammed from the shots
+            bits = _outcome_bits(self.grid_size)
+            measurements = [
+                (result.data(i)['probabilities'] @ bits, result.get_counts(i))
+                for i in range(len(all_angles))
+            ]
+
+        for key, (probabilities, counts) in zip(missing, measurements):
+            self._circuit_cache[key] = {
+                "circuit_repr": f"{self.grid_size}q-RY({sum(key)} hits)",
+                "counts": counts,
+                "probabilities": probabilities,
+                "total_shots": SHOTS
+            }
+
+    def _analytic_measurements(self, hit_counts: Tuple[int, ...]) -> Tuple[np.ndarray, Dict[str, int]]:
+        """
+        Compute the circuit's measurement statistics without simulating it.
+
+        Probabilities are exact (see _analytic_distribution); counts are this
+        game's multinomial sample of SHOTS shots from the same distribution.
 
         Args:
-            counts: Measurement counts from quantum circuit
+            hit_counts: Number of bombs that hit a ship, per qubit
 
         Returns:
-            List of probabilities (one per grid position)
+            (probabilities of |1⟩ per qubit, counts keyed by bitstring with qubit 0 rightmost)
         """
-        total_shots = sum(counts.values())
-        probabilities = [0.0] * self.grid_size
+        p_one, outcome_probs = _analytic_distribution(hit_counts)
 
-        for bitstring, count in counts.items():
-            # Bitstring is in reverse order (qubit 0 is rightmost)
-            for i in range(self.grid_size):
-                if bitstring[-(i + 1)] == '1':  # Read from right to left
-                    probabilities[i] += count
-
-        # Convert to probabilities (0.0 to 1.0)
-        probabilities = [p / total_shots for p in probabilities]
+        samples = self.rng.multinomial(SHOTS, outcome_probs)
+        counts = {
+            format(outcome, f'0{self.grid_size}b'): n
+            for outcome, n in enumerate(samples.tolist()) if n
+        }
 
-        return probabilities
+        return p_one, counts
 
     def calculateDamageToShips(
             self,
-            probabilities: List[float],
-            ship_positions: List[int],
-            current_damage: List[float]
+            probabilities: Union[List[float], np.ndarray],
+            ship_positions: Union[List[int], np.ndarray],
+            current_damage: np.ndarray
     ) -> Dict:
         """
         Convert quantum measurement probabilities to damage percentages.
 
         Args:
             probabilities: Probability of each qubit being |1⟩
-            ship_positions: Positions where ships are located
-            current_damage: Current damage levels
+            ship_positions: Positions where ships are located (list or intp array)
+            current_damage: Current damage levels (float32 array)
 
         Returns:
-            Dict with damage information
+            Dict with damage information (numpy arrays serialize directly with orjson)
         """
-        # Convert probabilities to percentages (0-100%)
-        damage_percentages = [p * 100 for p in probabilities]
-
-        # Update cumulative damage (damage accumulates over rounds)
-        updated_damage = []
-        for i in range(self.grid_size):
-            # Damage accumulates but caps at 100%
-            new_damage = min(100.0, current_damage[i] + damage_percentages[i])
-            updated_damage.append(new_damage)
-
-        # Calculate ship-specific damage
-        ship_damage = {
-            pos: updated_damage[pos] for pos in ship_positions
-        }
+        # Convert probabilities to percentages (0-100%) and update cumulative
+        # damage (damage accumulates but caps at 100%)
+        damage_percentages, updated_damage = accumulate_damage(
+            np.asarray(probabilities, dtype=np.float32), current_damage
+        )
+
+        # Calculate ship-specific damage (one gather for all ships)
+        ships = np.asarray(ship_positions, dtype=np.intp)
+        ship_values = updated_damage[ships]
+        ship_damage = dict(zip(ships.tolist(), ship_values))
 
         # Check if any ships are destroyed (>95% damage)
-        destroyed_ships = [
-            pos for pos, damage in ship_damage.items() if damage >= 95.0
-        ]
+        destroyed_ships = ships[ship_values >= 95.0]
 
         return {
             "probabilities": probabilities,
@@ -274,15 +593,9 @@ class QuantumBattleshipGame:
 
     def _check_game_over(self):
         """Check if game is over (all 3 ships of a player > 95% damage)"""
-        # Check player 1's ships
-        player1_ships_damaged = sum(
-            1 for pos in self.player1_ships if self.player1_damage[pos] >= 95.0
-        )
-
-        # Check player 2's ships
-        player2_ships_damaged = sum(
-            1 for pos in self.player2_ships if self.player2_damage[pos] >= 95.0
-        )
+        # Count ships at or above the threshold with one comparison per player
+        player1_ships_damaged = np.count_nonzero(self.player1_damage[self.player1_ships_np] >= 95.0)
+        player2_ships_damaged = np.count_nonzero(self.player2_damage[self.player2_ships_np] >= 95.0)
 
         if player1_ships_damaged >= self.ships_per_player:
             self.game_over = True
@@ -301,7 +614,14 @@ class QuantumBattleshipGame:
         Returns:
             Dict with game state
         """
-        state = {
+        if player_view == 0:  # Full state (for debugging/admin)
+            return self._state_full()
+        elif player_view == 1:  # Player 1's view
+            return self._state_p1()
+        elif player_view == 2:  # Player 2's view
+            return self._state_p2()
+
+        return {
             "game_id": self.game_id,
             "grid_size": self.grid_size,
             "current_round": self.current_round,
@@ -309,34 +629,63 @@ class QuantumBattleshipGame:
             "winner": self.winner
         }
 
-        # Add player-specific info based on view
-        if player_view == 0:  # Full state (for debugging/admin)
-            state.update({
-                "player1_ships": self.player1_ships,
-                "player2_ships": self.player2_ships,
-                "player1_damage": self.player1_damage,
-                "player2_damage": self.player2_damage,
-                "player1_bombs": self.player1_bombs,
-                "player2_bombs": self.player2_bombs
-            })
-        elif player_view == 1:  # Player 1's view
-            state.update({
-                "my_ships": self.player1_ships,
-                "my_damage": self.player1_damage,
-                "my_bombs": self.player1_bombs,
-                "opponent_damage": self.player2_damage,  # Can see opponent damage
-                "opponent_bombs": self.player2_bombs
-            })
-        elif player_view == 2:  # Player 2's view
-            state.update({
-                "my_ships": self.player2_ships,
-                "my_damage": self.player2_damage,
-                "my_bombs": self.player2_bombs,
-                "opponent_damage": self.player1_damage,
-                "opponent_bombs": self.player1_bombs
-            })
+    def _state_full(self) -> Dict:
+        """Full game state, both players visible"""
+        return {
+            "game_id": self.game_id,
+            "grid_size": self.grid_size,
+            "current_round": self.current_round,
+            "game_over": self.game_over,
+            "winner": self.winner,
+            "player1_ships": self.player1_ships,
+            "player2_ships": self.player2_ships,
+            "player1_damage": self.player1_damage,
+            "player2_damage": self.player2_damage,
+            "player1_bombs": self.player1_bombs.tolist(),
+            "player2_bombs": self.player2_bombs.tolist()
+        }
 
-        return state
+    def _state_p1(self) -> Dict:
+        """Player 1's view (opponent ships hidden)"""
+        return {
+            "game_id": self.game_id,
+            "grid_size": self.grid_size,
+            "current_round": self.current_round,
+            "game_over": self.game_over,
+            "winner": self.winner,
+            "my_ships": self.player1_ships,
+            "my_damage": self.player1_damage,
+            "my_bombs": self.player1_bombs.tolist(),
+            "opponent_damage": self.player2_damage,  # Can see opponent damage
+            "opponent_bombs": self.player2_bombs.tolist()
+        }
+
+    def _state_p2(self) -> Dict:
+        """Player 2's view (opponent ships hidden)"""
+        return {
+            "game_id": self.game_id,
+            "grid_size": self.grid_size,
+            "current_round": self.current_round,
+            "game_over": self.game_over,
+            "winner": self.winner,
+            "my_ships": self.player2_ships,
+            "my_damage": self.player2_damage,
+            "my_bombs": self.player2_bombs.tolist(),
+            "opponent_damage": self.player1_damage,
+            "opponent_bombs": self.player1_bombs.tolist()
+        }
+
+    def draw_circuit(self, player: int) -> str:
+        """
+        Text drawing of the circuit behind this player's latest bomb.
+
+        Args:
+            player: 1 or 2 (who is bombing)
+
+        Returns:
+            Circuit diagram as a string
+        """
+        return get_circuit_drawing(tuple(self.player1_hits if player == 1 else self.player2_hits))
 
     def visualize_damage_map(self, player: int) -> str:
         """
@@ -351,35 +700,7 @@ class QuantumBattleshipGame:
         damage = self.player1_damage if player == 1 else self.player2_damage
         ships = self.player1_ships if player == 1 else self.player2_ships
 
-        viz = f"\n=== Player {player} Damage Map ===\n"
-        viz += "Position: "
-        for i in range(self.grid_size):
-            viz += f"  {i}  "
-        viz += "\n"
-
-        viz += "Damage:   "
-        for i in range(self.grid_size):
-            ship_marker = "S" if i in ships else " "
-            viz += f"{damage[i]:4.1f}%{ship_marker}"
-        viz += "\n"
-
-        viz += "Status:   "
-        for i in range(self.grid_size):
-            if i in ships:
-                if damage[i] >= 95.0:
-                    status = "DEST"
-                elif damage[i] >= 50.0:
-                    status = "CRIT"
-                elif damage[i] > 0:
-                    status = "DMGD"
-                else:
-                    status = "SAFE"
-            else:
-                status = "----"
-            viz += f" {status} "
-        viz += "\n"
-
-        return viz
+        return _render_damage_map(player, tuple(damage), tuple(ships))
 
     def to_dict(self) -> Dict:
         """Convert game to dictionary for JSON serialization"""
@@ -391,8 +712,8 @@ class QuantumBattleshipGame:
             "player2_ships": self.player2_ships,
             "player1_damage": self.player1_damage,
             "player2_damage": self.player2_damage,
-            "player1_bombs": self.player1_bombs,
-            "player2_bombs": self.player2_bombs,
+            "player1_bombs": self.player1_bombs.tolist(),
+            "player2_bombs": self.player2_bombs.tolist(),
             "current_round": self.current_round,
             "game_over": self.game_over,
             "winner": self.winner
@@ -0,0 +1,39 @@
+"""
+Serialized response cache for the Flask APIs
+Stores encoded JSON bodies keyed by (game_id, view, state_version)
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+
+class ResponseCache:
+    """
+    Bounded LRU cache of pre-serialized JSON response bodies.
+
+    Entries are never invalidated explicitly: every state change gives the
+    game a new state_version, so stale keys simply stop being requested and
+    age out of the LRU.
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        """Return the cached body for key, or None on a miss"""
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+            return body
+
+    def put(self, key: Hashable, body: bytes):
+        """Store a serialized body, evicting the least recently used entry"""
+        with self._lock:
+            self._entries[key] = body
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
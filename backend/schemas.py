@@ -0,0 +1,69 @@
+"""
+Request payload validation for the Flask APIs
+JSON schemas compiled once at import with fastjsonschema
+"""
+
+from typing import Callable, Dict, Optional
+import fastjsonschema
+
+# Draft 4: "integer" rejects floats such as 2.0 and booleans
+_DRAFT = 'http://json-schema.org/draft-04/schema#'
+
+
+def _compile(required: list, properties: dict) -> Callable:
+    return fastjsonschema.compile({
+        '$schema': _DRAFT,
+        'type': 'object',
+        'required': required,
+        'properties': properties
+    })
+
+
+# Quantum API (app_quantum.py)
+validate_set_ships = _compile(['player', 'positions'], {
+    'player': {'enum': [1, 2]},
+    'positions': {
+        'type': 'array',
+        'minItems': 3,
+        'maxItems': 3,
+        'items': {'type': 'integer', 'minimum': 0, 'maximum': 4}
+    }
+})
+
+validate_bomb = _compile(['player', 'position'], {
+    'player': {'enum': [1, 2]},
+    'position': {'type': 'integer', 'minimum': 0, 'maximum': 4}
+})
+
+# Classic API (app.py)
+validate_place_ship = _compile(['ship_type', 'start_x', 'start_y', 'orientation'], {
+    'ship_type': {'type': 'string'},
+    'start_x': {'type': 'integer'},
+    'start_y': {'type': 'integer'},
+    'orientation': {'type': 'string'}
+})
+
+validate_shoot = _compile(['x', 'y'], {
+    'x': {'type': 'integer', 'minimum': 0, 'maximum': 9},
+    'y': {'type': 'integer', 'minimum': 0, 'maximum': 9}
+})
+
+
+def check(validator: Callable, data, messages: Dict[str, str]) -> Optional[str]:
+    """
+    Run a compiled validator against a request payload.
+
+    Args:
+        validator: One of the validate_* functions above
+        data: Decoded request body
+        messages: Error message per failing field ('data' is the payload
+            itself, e.g. a missing field); other failures use the schema error
+
+    Returns:
+        None if the payload is valid, otherwise the error message
+    """
+    try:
+        validator(data)
+    except fastjsonschema.JsonSchemaValueException as e:
+        return messages.get(e.name, str(e))
+    return None
@@ -0,0 +1,41 @@
+"""
+Tests for the classic Battleship API
+Request validation through the Flask test client
+"""
+
+import pytest
+
+from app import app
+
+
+@pytest.fixture
+def client():
+    """One test client, so every request of a test shares its session"""
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+
+@pytest.fixture
+def game_url(client):
+    """A game ready for the player's first shot"""
+    game_id = client.post('/api/game/new', json={}).get_json()["game_id"]
+    url = f'/api/game/{game_id}'
+    client.post(f'{url}/setup', json={"use_quantum": False})
+    client.post(f'{url}/auto-place')
+    yield url
+    client.delete(url)
+
+
+@pytest.mark.parametrize("x, y", [(2.0, 3), (3.5, 3), (3, 1.5), (10, 0), (0, -1), (True, 0), ("3", 3)])
+def test_shoot_rejects_bad_coordinates(client, game_url, x, y):
+    """Only whole numbers 0-9 are accepted; 2.0 and True are not integers here"""
+    response = client.post(f'{game_url}/shoot', json={"x": x, "y": y})
+    assert response.status_code == 400
+    assert not response.get_json()["success"]
+
+
+def test_shoot_accepts_board_cell(client, game_url):
+    response = client.post(f'{game_url}/shoot', json={"x": 9, "y": 9})
+    assert response.status_code == 200
+    assert response.get_json()["success"]
@@ -0,0 +1,78 @@
+"""
+Tests for the sharded game store
+Covers LRU eviction, the on_evict callback and the uncapped default
+"""
+
+import itertools
+
+import app_quantum
+import game_logic
+from concurrent_games import NUM_SHARDS, ShardedGameStore
+from game_logic import GameManager
+
+
+def same_bucket_ids(count):
+    """Game IDs that all hash to one bucket (string hashes vary per process)"""
+    ids = (f"game-{i}" for i in itertools.count())
+    first = next(ids)
+    bucket = hash(first) & (NUM_SHARDS - 1)
+    matches = (game_id for game_id in ids if hash(game_id) & (NUM_SHARDS - 1) == bucket)
+    return [first] + list(itertools.islice(matches, count - 1))
+
+
+def test_evicts_least_recently_used():
+    """A full bucket drops its least recently used game and reports it"""
+    evicted = []
+    store = ShardedGameStore(maxsize=2 * NUM_SHARDS, on_evict=lambda *item: evicted.append(item))
+    a, b, c = same_bucket_ids(3)
+
+    store.put(a, "A")
+    store.put(b, "B")
+    store.get(a)  # a is now the most recently used
+    store.put(c, "C")
+
+    assert evicted == [(b, "B")]
+    assert a in store and c in store and b not in store
+
+
+def test_create_if_absent_evicts():
+    """Creating a game through create_if_absent honours the cap too"""
+    evicted = []
+    store = ShardedGameStore(maxsize=NUM_SHARDS, on_evict=lambda *item: evicted.append(item))
+    a, b = same_bucket_ids(2)
+
+    store.create_if_absent(a, lambda: "A")
+    store.create_if_absent(b, lambda: "B")
+
+    assert evicted == [(a, "A")]
+    assert len(store) == 1
+
+
+def test_uncapped_store_never_evicts():
+    """Without a maxsize every game is kept"""
+    evicted = []
+    store = ShardedGameStore(on_evict=lambda *item: evicted.append(item))
+    for game_id in same_bucket_ids(50):
+        store.put(game_id, game_id)
+
+    assert evicted == []
+    assert len(store) == 50
+
+
+def test_quantum_store_is_uncapped():
+    """In-progress quantum games are never evicted"""
+    assert app_quantum.games.maxsize is None
+
+
+def test_game_manager_evicts_ai_with_game(monkeypatch):
+    """An evicted classic game takes its AI with it"""
+    monkeypatch.setattr(game_logic, "DEFAULT_MAX_GAMES", NUM_SHARDS)
+    manager = GameManager()
+    old, new = same_bucket_ids(2)
+
+    manager.create_game(old)
+    manager.create_game(new)
+
+    assert manager.get_game(old) is None
+    assert old not in manager.quantum_ai
+    assert new in manager.quantum_ai
@@ -0,0 +1,46 @@
+"""
+Tests for the classic Battleship game logic
+Covers AI board setup through GameManager
+"""
+
+import game_logic
+from game_logic import FLEET, MAX_SETUP_ATTEMPTS, GameManager
+
+
+def test_setup_ai_board_places_fleet():
+    """Setup places the whole fleet without overlaps and bumps the state version"""
+    manager = GameManager()
+    game = manager.create_game("setup")
+    version = game.state_version
+
+    assert manager.setup_ai_board("setup", use_quantum=False)
+
+    board = game.ai_board
+    assert [ship.ship_type for ship in board.ships] == list(FLEET)
+    assert bin(board.ship_mask).count("1") == sum(ship_type.length for ship_type in FLEET)
+    assert game.state_version != version
+
+
+def test_setup_ai_board_gives_up(monkeypatch):
+    """When the last ship never fits, setup stops after MAX_SETUP_ATTEMPTS with an empty board"""
+    real_random_placement = game_logic.random_placement
+    calls = []
+
+    def no_room_for_last_ship(ship_type, occupied_mask):
+        calls.append(ship_type)
+        if ship_type is FLEET[-1]:
+            return None
+        return real_random_placement(ship_type, occupied_mask)
+
+    monkeypatch.setattr(game_logic, "random_placement", no_room_for_last_ship)
+
+    manager = GameManager()
+    game = manager.create_game("exhausted")
+    version = game.state_version
+
+    assert not manager.setup_ai_board("exhausted", use_quantum=False)
+
+    assert calls.count(FLEET[-1]) == MAX_SETUP_ATTEMPTS
+    assert game.ai_board.ships == []
+    assert game.ai_board.ship_mask == 0
+    assert game.state_version != version
@@ -0,0 +1,119 @@
+"""
+Tests for the classic Battleship models
+Checks GameBoard placement, shots and sinking against hand-built boards
+"""
+
+import pytest
+
+from models import GameBoard, Orientation, Ship, ShipType
+
+H = Orientation.HORIZONTAL
+V = Orientation.VERTICAL
+
+
+@pytest.fixture
+def board():
+    """10x10 board: destroyer at (0, 0)-(0, 1), cruiser at (2, 5)-(4, 5)"""
+    board = GameBoard()
+    assert board.place_ship(Ship(ShipType.DESTROYER, (0, 0), H))
+    assert board.place_ship(Ship(ShipType.CRUISER, (2, 5), V))
+    return board
+
+
+def test_place_ship_sets_cells(board):
+    """Placed ships show on the revealed grid only"""
+    grid = board.get_visible_grid(hide_ships=False)
+    ship_cells = {(x, y) for x in range(10) for y in range(10) if grid[x][y] == "ship"}
+    assert ship_cells == {(0, 0), (0, 1), (2, 5), (3, 5), (4, 5)}
+
+    hidden = board.get_visible_grid(hide_ships=True)
+    assert all(cell == "empty" for row in hidden for cell in row)
+
+
+@pytest.mark.parametrize("ship, valid", [
+    (Ship(ShipType.BATTLESHIP, (0, 1), H), False),  # Covers the destroyer's (0, 1)
+    (Ship(ShipType.SUBMARINE, (3, 4), H), False),  # Crosses the cruiser at (3, 5)
+    (Ship(ShipType.DESTROYER, (1, 0), H), True),  # Alongside the destroyer, no overlap
+    (Ship(ShipType.CARRIER, (5, 5), V), True),  # Ends exactly on the last row
+])
+def test_place_ship_overlap(board, ship, valid):
+    """Ships may touch but not share a cell"""
+    assert board.is_valid_position(ship) is valid
+    assert board.place_ship(ship) is valid
+    assert len(board.ships) == (3 if valid else 2)
+
+
+@pytest.mark.parametrize("ship", [
+    Ship(ShipType.CARRIER, (0, 6), H),  # Runs off the right edge
+    Ship(ShipType.CARRIER, (6, 0), V),  # Runs off the bottom edge
+    Ship(ShipType.DESTROYER, (-1, 0), H),  # Starts above the board
+    Ship(ShipType.DESTROYER, (10, 0), H),  # Starts below the board
+])
+def test_place_ship_out_of_bounds(ship):
+    """Placements leaving the board are rejected without touching it"""
+    board = GameBoard()
+    assert not board.is_valid_position(ship)
+    assert not board.place_ship(ship)
+    assert board.ships == []
+    assert board.ship_mask == 0
+
+
+def test_hit_miss_and_sink(board):
+    """Shots report hit/miss, and the last segment of a ship sinks it"""
+    assert board.receive_shot((5, 5))["result"] == "miss"
+
+    first = board.receive_shot((0, 0))
+    assert first["result"] == "hit"
+    assert first["ship_name"] == "Destroyer"
+    assert not first["is_sunk"]
+
+    second = board.receive_shot((0, 1))
+    assert second["result"] == "hit"
+    assert second["is_sunk"]
+
+    destroyer, cruiser = board.ships
+    assert destroyer.is_sunk()
+    assert not cruiser.is_sunk()
+    assert board.to_dict()["ships_remaining"] == 1
+
+    grid = board.get_visible_grid(hide_ships=True)
+    assert grid[0][0] == grid[0][1] == "hit"
+    assert grid[5][5] == "miss"
+
+
+def test_repeat_shot(board):
+    """Shooting a cell twice changes nothing the second time"""
+    board.receive_shot((0, 0))
+    board.receive_shot((9, 9))
+
+    assert board.receive_shot((0, 0))["result"] == "already_shot"
+    assert board.receive_shot((9, 9))["result"] == "already_shot"
+    assert board.shots_taken == {(0, 0), (9, 9)}
+    assert board.to_dict()["ships_remaining"] == 2
+
+    # A repeated hit on a sunk ship's cell must not count the sinking again
+    board.receive_shot((0, 1))
+    board.receive_shot((0, 1))
+    assert board.to_dict()["ships_remaining"] == 1
+
+
+def test_all_ships_sunk(board):
+    """The board is finished exactly when every ship's last cell is hit"""
+    cells = [(0, 0), (0, 1), (2, 5), (3, 5), (4, 5)]
+    for cell in cells[:-1]:
+        board.receive_shot(cell)
+        assert not board.all_ships_sunk()
+
+    board.receive_shot(cells[-1])
+    assert board.all_ships_sunk()
+    assert all(ship.is_sunk() for ship in board.ships)
+
+
+def test_clear(board):
+    """A cleared board accepts a fresh layout and forgets old shots"""
+    board.receive_shot((0, 0))
+    board.clear()
+
+    assert board.ships == []
+    assert board.shots_taken == set()
+    assert board.receive_shot((0, 0))["result"] == "miss"
@@ -5,10 +5,12 @@ Tests the Elitzur-Vaidman bomb tester based game
 
 import requests
 import json
-import time
 
 BASE_URL = "http://localhost:5000"
 
+# One keep-alive connection for every request in the run
+session = requests.Session()
+
 
 def print_response(title, response):
     """Pretty print API response"""
@@ -43,11 +45,11 @@ def test_quantum_game_flow():
     print("=" * 70 + "\n")
 
     # 1. Check health
-    response = requests.get(f"{BASE_URL}/api/quantum/health")
+    response = session.get(f"{BASE_URL}/api/quantum/health")
     print_response("Health Check", response)
 
     # 2. Create new quantum game
-    response = requests.post(f"{BASE_URL}/api/quantum/game/new")
+    response = session.post(f"{BASE_URL}/api/quantum/game/new")
     print_response("Create Quantum Game", response)
 
     if response.status_code != 201:
@@ -59,21 +61,21 @@ def test_quantum_game_flow():
 
     # 3. Set ship positions for both players
     # Player 1 ships at positions 0, 2, 4
-    response = requests.post(
+    response = session.post(
         f"{BASE_URL}/api/quantum/game/{game_id}/set-ships",
         json={"player": 1, "positions": [0, 2, 4]}
     )
     print_response("Set Player 1 Ships (0, 2, 4)", response)
 
     # Player 2 ships at positions 1, 2, 3
-    response = requests.post(
+    response = session.post(
         f"{BASE_URL}/api/quantum/game/{game_id}/set-ships",
         json={"player": 2, "positions": [1, 2, 3]}
     )
     print_response("Set Player 2 Ships (1, 2, 3)", response)
 
     # 4. Get quantum circuit information
-    response = requests.get(f"{BASE_URL}/api/quantum/game/{game_id}/quantum-info")
+    response = session.get(f"{BASE_URL}/api/quantum/game/{game_id}/quantum-info")
     print_response("Quantum Circuit Information", response)
 
     # 5. Play several rounds
@@ -92,7 +94,7 @@ def test_quantum_game_flow():
     for round_num, (player, position) in enumerate(rounds, 1):
         print(f"\n--- Round {round_num}: Player {player} bombs position {position} ---")
 
-        response = requests.post(
+        response = session.post(
             f"{BASE_URL}/api/quantum/game/{game_id}/bomb",
             json={"player": player, "position": position}
         )
@@ -104,18 +106,16 @@ def test_quantum_game_flow():
             print(f"🏆 Winner: Player {winner}")
             break
 
-        time.sleep(0.5)  # Brief pause between rounds
-
     # 6. Get final visualization
-    response = requests.get(f"{BASE_URL}/api/quantum/game/{game_id}/visualize")
+    response = session.get(f"{BASE_URL}/api/quantum/game/{game_id}/visualize")
     print_response("Final Damage Visualization", response)
 
     # 7. Get full game state
-    response = requests.get(f"{BASE_URL}/api/quantum/game/{game_id}?view=0")
+    response = session.get(f"{BASE_URL}/api/quantum/game/{game_id}?view=0")
     print_response("Full Game State", response)
 
     # Clean up
-    requests.delete(f"{BASE_URL}/api/quantum/game/{game_id}")
+    session.delete(f"{BASE_URL}/api/quantum/game/{game_id}")
 
     print("\n✅ Quantum Game Test Complete!\n")
 
@@ -128,11 +128,11 @@ def test_auto_setup():
     print("=" * 70 + "\n")
 
     # Create game
-    response = requests.post(f"{BASE_URL}/api/quantum/game/new")
+    response = session.post(f"{BASE_URL}/api/quantum/game/new")
     game_id = response.json()["game_id"]
 
     # Auto-setup ships
-    response = requests.post(f"{BASE_URL}/api/quantum/game/{game_id}/auto-setup")
+    response = session.post(f"{BASE_URL}/api/quantum/game/{game_id}/auto-setup")
     print_response("Auto-Setup Ships", response)
 
     # Play a few rounds with auto-setup
@@ -140,7 +140,7 @@ def test_auto_setup():
         player = 1 if i % 2 == 0 else 2
         position = i % 5
 
-        response = requests.post(
+        response = session.post(
             f"{BASE_URL}/api/quantum/game/{game_id}/bomb",
             json={"player": player, "position": position}
         )
@@ -154,11 +154,11 @@ def test_auto_setup():
             break
 
     # Visualize
-    response = requests.get(f"{BASE_URL}/api/quantum/game/{game_id}/visualize")
+    response = session.get(f"{BASE_URL}/api/quantum/game/{game_id}/visualize")
     print_response("Auto-Setup Visualization", response)
 
     # Clean up
-    requests.delete(f"{BASE_URL}/api/quantum/game/{game_id}")
+    session.delete(f"{BASE_URL}/api/quantum/game/{game_id}")
 
     print("\n✅ Auto-Setup Test Complete!\n")
 
@@ -175,17 +175,17 @@ def demonstrate_quantum_detection():
     print("=" * 70 + "\n")
 
     # Create game
-    response = requests.post(f"{BASE_URL}/api/quantum/game/new")
+    response = session.post(f"{BASE_URL}/api/quantum/game/new")
     game_id = response.json()["game_id"]
 
     # Set ships
     # Player 1: ships at 0, 1, 2
     # Player 2: ships at 2, 3, 4
-    requests.post(
+    session.post(
         f"{BASE_URL}/api/quantum/game/{game_id}/set-ships",
         json={"player": 1, "positions": [0, 1, 2]}
     )
-    requests.post(
+    session.post(
         f"{BASE_URL}/api/quantum/game/{game_id}/set-ships",
         json={"player": 2, "positions": [2, 3, 4]}
     )
@@ -195,7 +195,7 @@ def demonstrate_quantum_detection():
     print("  Player 2 ships: [2, 3, 4]\n")
 
     print(" Player 1 will bomb position 2 (which HAS a Player 2 ship)")
-    response = requests.post(
+    response = session.post(
         f"{BASE_URL}/api/quantum/game/{game_id}/bomb",
         json={"player": 1, "position": 2}
     )
@@ -215,7 +215,7 @@ def demonstrate_quantum_detection():
     print("   interference pattern changes, even without 'hitting' it directly!")
 
     # Clean up
-    requests.delete(f"{BASE_URL}/api/quantum/game/{game_id}")
+    session.delete(f"{BASE_URL}/api/quantum/game/{game_id}")
 
     print("\n Quantum Detection Demo Complete!\n")
 
@@ -228,40 +228,40 @@ def test_validation():
     print("=" * 70 + "\n")
 
     # Create game
-    response = requests.post(f"{BASE_URL}/api/quantum/game/new")
+    response = session.post(f"{BASE_URL}/api/quantum/game/new")
     game_id = response.json()["game_id"]
 
     # Test invalid ship positions
     print("Test 1: Invalid number of ships (4 instead of 3)")
-    response = requests.post(
+    response = session.post(
         f"{BASE_URL}/api/quantum/game/{game_id}/set-ships",
         json={"player": 1, "positions": [0, 1, 2, 3]}
     )
     print(f"  Result: {response.json()['message']}\n")
 
     print("Test 2: Duplicate positions")
-    response = requests.post(
+    response = session.post(
         f"{BASE_URL}/api/quantum/game/{game_id}/set-ships",
         json={"player": 1, "positions": [0, 0, 1]}
     )
     print(f"  Result: {response.json()['message']}\n")
 
     print("Test 3: Out of range position")
-    response = requests.post(
+    response = session.post(
         f"{BASE_URL}/api/quantum/game/{game_id}/set-ships",
         json={"player": 1, "positions": [0, 1, 5]}
     )
     print(f"  Result: {response.json()['message']}\n")
 
     print("Test 4: Valid setup")
-    response = requests.post(
+    response = session.post(
         f"{BASE_URL}/api/quantum/game/{game_id}/set-ships",
         json={"player": 1, "positions": [0, 2, 4]}
     )
     print(f"  Result: {response.json()['message']}\n")
 
     # Clean up
-    requests.delete(f"{BASE_URL}/api/quantum/game/{game_id}")
+    session.delete(f"{BASE_URL}/api/quantum/game/{game_id}")
 
     print("✅ Validation Tests Complete!\n")
 
@@ -274,7 +274,7 @@ if __name__ == "__main__":
 
         # Test if server is running
         try:
-            requests.get(f"{BASE_URL}/api/quantum/health")
+            session.get(f"{BASE_URL}/api/quantum/health")
         except requests.exceptions.ConnectionError:
             print(" ERROR: Cannot connect to server!")
             print("   Please start the server first: python app_quantum.py")
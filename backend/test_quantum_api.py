@@ -4,11 +4,13 @@ Test Script for Quantum Battleship API - Hackathon Implementation
 
 import requests
 import json
-import time
 
 BASE_URL = "http://localhost:5001"
 HEADERS = {"Content-Type": "application/json"}
 
+# One keep-alive connection for every request in the run
+session = requests.Session()
+
 
 def print_response(title, response):
     """Pretty print API response"""
@@ -38,11 +40,11 @@ def test_quantum_game_flow():
     print("=" * 70 + "\n")
 
     # Health check
-    response = requests.get(f"{BASE_URL}/api/quantum/health")
+    response = session.get(f"{BASE_URL}/api/quantum/health")
     print_response("Health Check", response)
 
     # Create game
-    response = requests.post(
+    response = session.post(
         f"{BASE_URL}/api/quantum/game/new",
         headers=HEADERS,
         json={}
@@ -57,14 +59,14 @@ def test_quantum_game_flow():
     print(f" Quantum Game Created! ID: {game_id}\n")
 
     # Set ships
-    response = requests.post(
+    response = session.post(
         f"{BASE_URL}/api/quantum/game/{game_id}/set-ships",
         headers=HEADERS,
         json={"player": 1, "positions": [0, 2, 4]}
     )
     print_response("Set Player 1 Ships (0, 2, 4)", response)
 
-    response = requests.post(
+    response = session.post(
         f"{BASE_URL}/api/quantum/game/{game_id}/set-ships",
         headers=HEADERS,
         json={"player": 2, "positions": [1, 2, 3]}
@@ -72,7 +74,7 @@ def test_quantum_game_flow():
     print_response("Set Player 2 Ships (1, 2, 3)", response)
 
     # Get quantum info
-    response = requests.get(f"{BASE_URL}/api/quantum/game/{game_id}/quantum-info")
+    response = session.get(f"{BASE_URL}/api/quantum/game/{game_id}/quantum-info")
     print_response("Quantum Circuit Information", response)
 
     # Play rounds
@@ -83,7 +85,7 @@ def test_quantum_game_flow():
     for round_num, (player, position) in enumerate(rounds, 1):
         print(f"\n--- Round {round_num}: Player {player} bombs position {position} ---")
 
-        response = requests.post(
+        response = session.post(
             f"{BASE_URL}/api/quantum/game/{game_id}/bomb",
             headers=HEADERS,
             json={"player": player, "position": position}
@@ -95,14 +97,12 @@ def test_quantum_game_flow():
             print(f"🏆 Winner: Player {response.json()['winner']}")
             break
 
-        time.sleep(0.5)
-
     # Final visualization
-    response = requests.get(f"{BASE_URL}/api/quantum/game/{game_id}/visualize")
+    response = session.get(f"{BASE_URL}/api/quantum/game/{game_id}/visualize")
     print_response("Final Damage Visualization", response)
 
     # Cleanup
-    requests.delete(f"{BASE_URL}/api/quantum/game/{game_id}")
+    session.delete(f"{BASE_URL}/api/quantum/game/{game_id}")
     print("\n✅ Quantum Game Test Complete!\n")
 
 
@@ -112,7 +112,7 @@ if __name__ == "__main__":
         print(" Make sure the server is running: python app_quantum.py\n")
 
         try:
-            requests.get(f"{BASE_URL}/api/quantum/health")
+            session.get(f"{BASE_URL}/api/quantum/health")
         except requests.exceptions.ConnectionError:
             print(" ERROR: Cannot connect to server!")
             exit(1)
@@ -0,0 +1,208 @@
+"""
+Tests for the Quantum Battleship API
+Plays games end to end through the Flask test client, with no server running
+"""
+
+import numpy as np
+import pytest
+
+import app_quantum
+from app_quantum import app
+from circuit_pool import run_rotations
+from quantum_battleship_core import QuantumBattleshipGame
+
+# Safety cap on bombs per player; a game is normally won well within it
+MAX_ROUNDS = 200
+
+
+@pytest.fixture
+def client():
+    """One test client, so every request of a test shares its session"""
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+
+def new_game(client, game_id):
+    """Create a game with a fixed ID, replacing any left over from a previous run"""
+    client.delete(f'/api/quantum/game/{game_id}')
+    response = client.post('/api/quantum/game/new', json={"game_id": game_id})
+    assert response.status_code == 201
+    return response.get_json()
+
+
+def test_full_game(client):
+    """Play a complete game: create, place ships, bomb until someone wins"""
+    game_id = "pytest-full-game"
+    data = new_game(client, game_id)
+    assert data["game_info"]["grid_size"] == 5
+
+    for player, positions in ((1, [0, 1, 2]), (2, [2, 3, 4])):
+        response = client.post(
+            f'/api/quantum/game/{game_id}/set-ships',
+            json={"player": player, "positions": positions}
+        )
+        assert response.status_code == 200
+        assert response.get_json()["success"]
+
+    # Player 1 cycles over player 2's ships; player 2 only bombs empty water
+    result = None
+    for round_number in range(MAX_ROUNDS):
+        position = (2, 3, 4)[round_number % 3]
+        response = client.post(
+            f'/api/quantum/game/{game_id}/bomb',
+            json={"player": 1, "position": position}
+        )
+        assert response.status_code == 200
+        result = response.get_json()
+        assert result["hit_ship"]
+        assert "damage_visualization" in result
+        if result["game_over"]:
+            break
+
+        response = client.post(
+            f'/api/quantum/game/{game_id}/bomb',
+            json={"player": 2, "position": 4}
+        )
+        assert response.status_code == 200
+        assert not response.get_json()["hit_ship"]
+
+    assert result["game_over"]
+    assert result["winner"] == 1
+
+    # Bombing after the end is refused
+    response = client.post(
+        f'/api/quantum/game/{game_id}/bomb',
+        json={"player": 2, "position": 0}
+    )
+    assert response.status_code == 400
+
+    state = client.get(f'/api/quantum/game/{game_id}').get_json()["state"]
+    assert state["game_over"]
+    assert state["winner"] == 1
+
+    response = client.get(f'/api/quantum/game/{game_id}/circuit?player=1')
+    assert response.status_code == 200
+    assert response.get_json()["circuit"]
+
+    assert client.get(f'/api/quantum/game/{game_id}/visualize').status_code == 200
+
+    assert client.delete(f'/api/quantum/game/{game_id}').status_code == 200
+    assert client.get(f'/api/quantum/game/{game_id}').status_code == 404
+
+
+def test_auto_setup_game(client):
+    """Auto-placed ships let both players bomb straight away"""
+    game_id = "pytest-auto-setup"
+    new_game(client, game_id)
+
+    response = client.post(f'/api/quantum/game/{game_id}/auto-setup')
+    assert response.status_code == 200
+
+    for player in (1, 2):
+        response = client.post(
+            f'/api/quantum/game/{game_id}/bomb',
+            json={"player": player, "position": 0}
+        )
+        assert response.status_code == 200
+        assert response.get_json()["success"]
+
+    client.delete(f'/api/quantum/game/{game_id}')
+
+
+@pytest.mark.parametrize("positions", [[0, 1, 2.5], [0, 1, 7], [0, 0, 1], [0, 1]])
+def test_set_ships_rejects_bad_positions(client, positions):
+    """Invalid ship positions are a 400, never a server error"""
+    game_id = "pytest-bad-ships"
+    new_game(client, game_id)
+
+    response = client.post(
+        f'/api/quantum/game/{game_id}/set-ships',
+        json={"player": 1, "positions": positions}
+    )
+    assert response.status_code == 400
+    assert not response.get_json()["success"]
+
+    client.delete(f'/api/quantum/game/{game_id}')
+
+
+def test_health_reports_backend(client):
+    """The health check names the backend bombs actually run on"""
+    data = client.get('/api/quantum/health').get_json()
+    assert data["status"] == "healthy"
+    expected = "qiskit_aer_simulator" if app_quantum.SIMULATE_CIRCUITS else "analytic"
+    assert data["quantum_backend"] == expected
+
+
+@pytest.mark.parametrize("position", [2.0, 2.5, 5, -1, True])
+def test_bomb_rejects_bad_position(client, position):
+    """Bomb positions must be whole numbers 0-4"""
+    game_id = "pytest-bad-bomb"
+    new_game(client, game_id)
+    client.post(f'/api/quantum/game/{game_id}/auto-setup')
+
+    response = client.post(
+        f'/api/quantum/game/{game_id}/bomb',
+        json={"player": 1, "position": position}
+    )
+    assert response.status_code == 400
+    assert not response.get_json()["success"]
+
+    client.delete(f'/api/quantum/game/{game_id}')
+
+
+def test_unknown_game(client):
+    """Requests for a game that does not exist are a 404"""
+    assert client.get('/api/quantum/game/pytest-missing').status_code == 404
+
+
+def placed_game(game_id, **kwargs):
+    """A game with ships at 0-2 for player 1 and 1-3 for player 2"""
+    game = QuantumBattleshipGame(game_id, **kwargs)
+    game.setShipPosition(1, [0, 1, 2])
+    game.setShipPosition(2, [1, 2, 3])
+    return game
+
+
+def test_bomb_ship_batch_matches_bomb_ship():
+    """A batch leaves the game exactly where the same bombs one by one would"""
+    positions = [1, 2, 2, 0, 3, 1]
+    one_by_one = placed_game("single")
+    batched = placed_game("batch")
+
+    expected = [one_by_one.bombShip(1, position) for position in positions]
+    results = batched.bombShipBatch(1, positions)
+
+    for single, batch in zip(expected, results):
+        assert batch["hit_ship"] == single["hit_ship"]
+        np.testing.assert_allclose(
+            batch["quantum_measurements"]["probabilities"],
+            single["quantum_measurements"]["probabilities"]
+        )
+    assert batched.player1_hits == one_by_one.player1_hits
+    np.testing.assert_array_equal(batched.player2_damage, one_by_one.player2_damage)
+
+
+def test_bomb_ship_batch_runs_pool_once():
+    """Simulated batches reach the worker pool in a single call"""
+    calls = []
+
+    def runner(angle_sets):
+        calls.append(len(angle_sets))
+        return run_rotations(angle_sets)
+
+    game = placed_game("pooled", circuit_runner=runner, simulate=True)
+    results = game.bombShipBatch(1, [1, 2, 2, 0, 1])
+
+    # Four distinct hit counts (position 0 misses and repeats the previous one)
+    assert calls == [4]
+    assert all(result["success"] for result in results)
+
+    # Pooled probabilities are the exact ones the analytic path computes
+    analytic = placed_game("analytic")
+    for result, expected in zip(results, analytic.bombShipBatch(1, [1, 2, 2, 0, 1])):
+        np.testing.assert_allclose(
+            result["quantum_measurements"]["probabilities"],
+            expected["quantum_measurements"]["probabilities"],
+            atol=1e-6
+        )
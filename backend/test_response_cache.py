@@ -0,0 +1,99 @@
+"""
+Tests for the serialized response cache
+Checks that cached GET bodies never outlive a state change
+"""
+
+import pytest
+
+import app as classic_app
+import app_quantum
+from response_cache import ResponseCache
+
+
+def test_lru_eviction():
+    """The least recently used body is dropped once the cache is full"""
+    cache = ResponseCache(maxsize=2)
+    cache.put("a", b"A")
+    cache.put("b", b"B")
+    cache.get("a")  # a is now the most recently used
+    cache.put("c", b"C")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"A"
+    assert cache.get("c") == b"C"
+
+
+@pytest.fixture
+def classic():
+    classic_app.app.config['TESTING'] = True
+    with classic_app.app.test_client() as client:
+        yield client
+
+
+@pytest.fixture
+def quantum():
+    app_quantum.app.config['TESTING'] = True
+    with app_quantum.app.test_client() as client:
+        yield client
+
+
+def test_classic_state_refreshes_after_each_change(classic):
+    """Every mutating endpoint makes the next GET serve a fresh body"""
+    game_id = classic.post('/api/game/new', json={}).get_json()["game_id"]
+    url = f'/api/game/{game_id}'
+
+    previous = classic.get(url).data
+
+    def changed(response):
+        """Assert the mutation succeeded and the state body moved on"""
+        nonlocal previous
+        assert response.status_code == 200
+        assert response.get_json()["success"]
+        body = classic.get(url).data
+        assert body != previous
+        assert classic.get(url).data == body  # Served from the cache until the next change
+        previous = body
+
+    assert classic.get(url).data == previous
+
+    changed(classic.post(f'{url}/setup', json={"use_quantum": False}))
+    changed(classic.post(f'{url}/place-ship', json={
+        "ship_type": "DESTROYER", "start_x": 0, "start_y": 0, "orientation": "horizontal"
+    }))
+    changed(classic.post(f'{url}/reset'))
+    changed(classic.post(f'{url}/setup', json={"use_quantum": False}))
+    changed(classic.post(f'{url}/auto-place'))
+    changed(classic.post(f'{url}/shoot', json={"x": 0, "y": 0}))
+    changed(classic.post(f'{url}/ai-turn'))
+    changed(classic.post(f'{url}/reset'))
+
+    classic.delete(url)
+
+
+def test_quantum_state_refreshes_after_each_change(quantum):
+    """Set-ships, bombs and resets all invalidate the cached quantum state"""
+    game_id = "pytest-response-cache"
+    quantum.delete(f'/api/quantum/game/{game_id}')
+    quantum.post('/api/quantum/game/new', json={"game_id": game_id})
+    url = f'/api/quantum/game/{game_id}'
+
+    previous = quantum.get(url).data
+
+    def changed(response):
+        """Assert the mutation succeeded and the state body moved on"""
+        nonlocal previous
+        assert response.status_code == 200
+        assert response.get_json()["success"]
+        body = quantum.get(url).data
+        assert body != previous
+        assert quantum.get(url).data == body  # Served from the cache until the next change
+        previous = body
+
+    changed(quantum.post(f'{url}/set-ships', json={"player": 1, "positions": [0, 1, 2]}))
+    changed(quantum.post(f'{url}/set-ships', json={"player": 2, "positions": [2, 3, 4]}))
+    changed(quantum.post(f'{url}/bomb', json={"player": 1, "position": 3}))
+    changed(quantum.post(f'{url}/bomb', json={"player": 2, "position": 4}))
+    changed(quantum.post(f'{url}/reset'))
+    changed(quantum.post(f'{url}/auto-setup'))
+
+    quantum.delete(url)
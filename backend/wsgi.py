@@ -0,0 +1,13 @@
+"""
+WSGI entry point for production servers
+Serves the quantum API by default; set BATTLESHIP_API=classic for app.py
+
+Usage: gunicorn -c gunicorn_config.py wsgi:app
+"""
+
+import os
+
+if os.getenv('BATTLESHIP_API', 'quantum') == 'classic':
+    from app import app
+else:
+    from app_quantum import app
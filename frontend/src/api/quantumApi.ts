@@ -21,7 +21,7 @@ export interface BombResult {
   bomb_position: number;
   hit_ship: boolean;
   quantum_measurements: {
-    circuit: string;
+    circuit_repr: string;
     counts: Record<string, number>;
     probabilities: number[];
     total_shots: number;